@@ -0,0 +1,91 @@
+"""Measures the game's time to first frame under the SDL dummy video driver.
+
+Every run is a fresh interpreter, so imports, subsystem init and asset loading
+are all included. The share spent after `import pygame` is reported
+separately. One warm-up run per mode is discarded so the texture atlas cache
+exists before timing starts.
+
+Usage: python -m benchmarks.cold_start [--runs 10] [--output cold_start.json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.stats import summarize_ms
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import time
+start = time.perf_counter()
+import pygame
+game_start = time.perf_counter()
+present = pygame.display.flip
+def timed_flip():
+    present()
+    now = time.perf_counter()
+    print(now - start, now - game_start, flush=True)
+pygame.display.flip = timed_flip
+import main
+main.main(max_frames = 1)
+"""
+
+
+def run_once(fast_start: bool) -> tuple[float, float, float]:
+    env = dict(
+        os.environ,
+        SDL_VIDEODRIVER = "dummy",
+        PYGAME_HIDE_SUPPORT_PROMPT = "1",
+        FAST_START = "1" if fast_start else "0",
+    )
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd = ROOT,
+        env = env,
+        capture_output = True,
+        text = True,
+        check = True
+    )
+    process_time = time.perf_counter() - started
+    first_frame, game_startup = (float(value) for value in result.stdout.split()[:2])
+    return first_frame, game_startup, process_time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = __doc__.splitlines()[0])
+    parser.add_argument("--runs", type = int, default = 10)
+    parser.add_argument("--output", help = "write the results as JSON to this path")
+    args = parser.parse_args()
+
+    results: dict = {"runs": args.runs, "python": sys.version.split()[0], "modes": {}}
+    for mode, fast_start in (("default", False), ("fast_start", True)):
+        run_once(fast_start)
+        samples: list[tuple[float, float, float]] = [
+            run_once(fast_start) for _ in range(args.runs)
+        ]
+        first_frames, game_startups, process_times = (list(column) for column in zip(*samples))
+        results["modes"][mode] = {
+            "time_to_first_frame": summarize_ms(first_frames),
+            "after_pygame_import": summarize_ms(game_startups),
+            "process_wall_time": summarize_ms(process_times),
+        }
+        first = results["modes"][mode]["time_to_first_frame"]
+        game = results["modes"][mode]["after_pygame_import"]
+        print(
+            f"{mode:<11} first frame: median {first['median_ms']:.1f} ms "
+            f"(min {first['min_ms']:.1f}, max {first['max_ms']:.1f}), "
+            f"{game['median_ms']:.1f} ms of it after importing pygame"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Measures the memory and attribute access cost of the simulation bodies.
+
+Creates many instances of every body class and whole LevelSimulations under
+tracemalloc, and times the attribute reads and writes the physics loop does.
+
+Usage: python -m benchmarks.entity_memory [--count 100000] [--output entity_benchmark.json]
+                                          [--compare previous.json]
+"""
+
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import gc
+import json
+import platform
+import time
+import timeit
+import tracemalloc
+
+from benchmarks.render_levels import git_commit, SCREEN_SIZE
+from others import TileType
+from simulation import LevelSimulation, PlayerBody, BookBody, SnackBody, ButtonBody, SprayBody
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FACTORIES = {
+    "PlayerBody": lambda i: PlayerBody(
+        TileType.BLUE_PLAYER, (i % 15, i % 15), TileType.BLUE_BED, SCREEN_SIZE
+    ),
+    "BookBody": lambda i: BookBody(i % 15, i % 15, SCREEN_SIZE),
+    "SnackBody": lambda i: SnackBody(i % 15, i % 15),
+    "ButtonBody": lambda i: ButtonBody(i % 15, i % 15),
+    "SprayBody": lambda i: SprayBody(i % 15, i % 15, 2),
+}
+
+
+def bytes_per_instance(factory, count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    instances = [factory(i) for i in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del instances
+    return size / count
+
+
+def access_ns(instance, number: int) -> dict[str, float]:
+    read = timeit.timeit(
+        "body.x; body.y; body.velocity", globals = {"body": instance}, number = number
+    )
+    write = timeit.timeit(
+        "body.x = 1.0; body.y = 2.0; body.velocity = 3.0",
+        globals = {"body": instance},
+        number = number
+    )
+    return {"read_ns": read / number / 3 * 1e9, "write_ns": write / number / 3 * 1e9}
+
+
+def compare(results: dict, previous_path: str) -> None:
+    with open(previous_path, "r", encoding="utf-8") as file:
+        previous = json.load(file)
+    print(f"\nChange against {previous_path} ({previous['meta'].get('commit')}):")
+    for name, current in results["bodies"].items():
+        before = previous["bodies"].get(name)
+        if before is None:
+            continue
+        for key in ("bytes", "read_ns", "write_ns"):
+            if key not in before or key not in current:
+                continue
+            old, new = before[key], current[key]
+            change = (new - old) / old * 100 if old else 0.0
+            print(f"  {name:<18} {key:<9} {old:10.1f} -> {new:10.1f} ({change:+.1f}%)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = __doc__.splitlines()[0])
+    parser.add_argument("--count", type = int, default = 100000)
+    parser.add_argument("--simulations", type = int, default = 1000)
+    parser.add_argument("--output", default = "entity_benchmark.json")
+    parser.add_argument("--compare", help = "previous results JSON to compare against")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    results: dict = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "count": args.count,
+        },
+        "bodies": {},
+    }
+
+    for name, factory in FACTORIES.items():
+        results["bodies"][name] = {"bytes": bytes_per_instance(factory, args.count)}
+    for name in ("PlayerBody", "BookBody"):
+        results["bodies"][name].update(access_ns(FACTORIES[name](0), 1000000))
+
+    level_path = os.path.join("levels", sorted(os.listdir("levels"))[0])
+    results["bodies"]["LevelSimulation"] = {
+        "bytes": bytes_per_instance(
+            lambda i: LevelSimulation.from_file(level_path, SCREEN_SIZE), args.simulations
+        )
+    }
+
+    for name, result in results["bodies"].items():
+        line = f"{name:<18} {result['bytes']:10.1f} bytes"
+        if "read_ns" in result:
+            line += f" | read {result['read_ns']:.1f} ns write {result['write_ns']:.1f} ns"
+        print(line)
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
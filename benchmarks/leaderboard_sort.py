@@ -0,0 +1,68 @@
+"""Measures how long the leaderboard takes to load, sort and page a large history.
+
+Fills a LevelHistoryManager with generated attempts, then times building the
+columns, the first sort by every column, switching between the sorted
+columns again and fetching one screen of entries.
+
+Usage: python -m benchmarks.leaderboard_sort [--count 1000000] [--page-size 18]
+"""
+
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import random
+import tempfile
+import time
+
+from others import LevelHistoryManager
+from others.leaderboard_columns import COLUMNS, LeaderboardColumns
+
+
+def fill(manager: LevelHistoryManager, count: int) -> None:
+    generator = random.Random(0)
+    for index in range(count):
+        manager._add(
+            f"Team {generator.randrange(500)}",
+            f"level{generator.randrange(40)}",
+            {
+                "time": generator.uniform(5, 300),
+                "points": generator.randrange(50),
+                "timestamp": f"2026-01-01T00:00:{index:09d}",
+            }
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = __doc__.splitlines()[0])
+    parser.add_argument("--count", type = int, default = 1000000)
+    parser.add_argument("--page-size", type = int, default = 18)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as history_dir:
+        manager = LevelHistoryManager(f"{history_dir}/history.json")
+    fill(manager, args.count)
+
+    started = time.perf_counter()
+    columns = LeaderboardColumns(manager.data)
+    print(f"columns for {len(columns)} attempts  {time.perf_counter() - started:8.3f} s")
+    for sort_key in COLUMNS:
+        started = time.perf_counter()
+        columns.order(sort_key, True)
+        print(f"first sort by {sort_key:<10}  {time.perf_counter() - started:8.3f} s")
+
+    switches = 1000
+    started = time.perf_counter()
+    for index in range(switches):
+        columns.order(COLUMNS[index % len(COLUMNS)], index % 2 == 0)
+    print(f"switching sort            {(time.perf_counter() - started) / switches * 1e6:8.1f} us")
+
+    started = time.perf_counter()
+    for index in range(switches):
+        columns.page("time", False, index * args.page_size, args.page_size)
+    print(f"one page                  {(time.perf_counter() - started) / switches * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""Measures GameScreen update and draw frame times for every level in levels/.
+
+Runs under the SDL dummy video driver with a fixed 60 Hz time step and the
+same scripted inputs for every level, and writes machine-readable results so
+runs from different commits can be compared.
+
+Usage: python -m benchmarks.render_levels [--ticks 600] [--output render_benchmark.json]
+                                          [--compare previous.json]
+"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import json
+import platform
+import subprocess
+import tempfile
+import time
+
+import pygame
+
+from benchmarks.stats import summarize_ms
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCREEN_SIZE = (960, 960)
+TICK = 1 / 60
+WARMUP_TICKS = 30
+
+# (key, press tick, release tick) repeated every SCRIPT_PERIOD ticks
+SCRIPT_PERIOD = 240
+INPUT_SCRIPT: list[tuple[int, int, int]] = [
+    (pygame.K_d, 0, 110),
+    (pygame.K_RIGHT, 0, 110),
+    (pygame.K_a, 120, 230),
+    (pygame.K_LEFT, 120, 230),
+    (pygame.K_w, 40, 41),
+    (pygame.K_UP, 60, 61),
+    (pygame.K_w, 160, 161),
+    (pygame.K_UP, 180, 181),
+]
+
+
+def scripted_events(tick: int) -> list[pygame.event.Event]:
+    phase = tick % SCRIPT_PERIOD
+    events: list[pygame.event.Event] = []
+    for key, press, release in INPUT_SCRIPT:
+        if phase == press:
+            events.append(pygame.event.Event(pygame.KEYDOWN, key = key, mod = 0, unicode = ""))
+        elif phase == release:
+            events.append(pygame.event.Event(pygame.KEYUP, key = key, mod = 0, unicode = ""))
+    return events
+
+
+def git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd = ROOT,
+            capture_output = True,
+            text = True,
+            check = True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def run_level(
+    game_screen,
+    screen: pygame.Surface,
+    wall: pygame.Surface,
+    level_path: str,
+    ticks: int
+) -> dict:
+    game_screen.load_level(level_path)
+    update_times: list[float] = []
+    draw_times: list[float] = []
+
+    for tick in range(WARMUP_TICKS + ticks):
+        for event in scripted_events(tick):
+            game_screen.handle_event(event)
+        # completion posts invalidation events that nothing consumes here
+        pygame.event.clear()
+
+        started = time.perf_counter()
+        game_screen.update(TICK)
+        updated = time.perf_counter()
+        screen.blit(wall, (0, 0))
+        game_screen.draw(screen)
+        drawn = time.perf_counter()
+
+        if tick >= WARMUP_TICKS:
+            update_times.append(updated - started)
+            draw_times.append(drawn - updated)
+
+    return {
+        "name": game_screen.level_name,
+        "error": game_screen.has_error,
+        "completed": game_screen.level_complete,
+        "update": summarize_ms(update_times),
+        "draw": summarize_ms(draw_times),
+    }
+
+
+def compare(results: dict, previous_path: str) -> None:
+    with open(previous_path, "r", encoding="utf-8") as file:
+        previous = json.load(file)
+    print(f"\nChange against {previous_path} ({previous['meta'].get('commit')}):")
+    for level, current in results["levels"].items():
+        before = previous["levels"].get(level)
+        if before is None:
+            continue
+        for phase in ("update", "draw"):
+            old = before[phase]["median_ms"]
+            new = current[phase]["median_ms"]
+            change = (new - old) / old * 100 if old else 0.0
+            print(f"  {level:<32} {phase:<6} {old:8.3f} -> {new:8.3f} ms ({change:+.1f}%)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = __doc__.splitlines()[0])
+    parser.add_argument("--ticks", type = int, default = 600)
+    parser.add_argument("--levels", default = "levels")
+    parser.add_argument("--output", default = "render_benchmark.json")
+    parser.add_argument("--compare", help = "previous results JSON to compare against")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    pygame.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+
+    # imported after the display exists, like in main()
+    from others import Assets, attempt_writer
+    from screens.gameplay import GameScreen
+
+    assets = Assets()
+    assets.preload()
+    game_screen = GameScreen(pygame.font.Font(None, 48), pygame.font.Font(None, 24), assets)
+
+    results: dict = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "ticks": args.ticks,
+            "tick_seconds": TICK,
+        },
+        "levels": {},
+    }
+
+    with tempfile.TemporaryDirectory() as history_dir:
+        # completed runs must not end up in the real leaderboard
+        game_screen.history_path = os.path.join(history_dir, "history.json")
+        level_files = sorted(file for file in os.listdir(args.levels) if file.endswith(".json"))
+        for level_file in level_files:
+            level = run_level(
+                game_screen, screen, assets.wall, os.path.join(args.levels, level_file), args.ticks
+            )
+            results["levels"][level_file] = level
+            print(
+                f"{level_file:<32} update median {level['update']['median_ms']:.3f} ms "
+                f"p95 {level['update']['p95_ms']:.3f} ms | draw median "
+                f"{level['draw']['median_ms']:.3f} ms p95 {level['draw']['p95_ms']:.3f} ms"
+            )
+        attempt_writer.flush()
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Measures how many LevelSimulation steps per second run without a display.
+
+Every level in levels/ is stepped at a fixed 60 Hz with scripted inputs and
+restarted whenever it completes. No window, surfaces or fonts are created.
+A generated level full of book stacks is also run with the per-book Python
+update and with the NumPy book engine. Generated levels with no snacks and
+with a snack on every free tile show that snacks cost a fixed amount per
+player, however many there are.
+
+Usage: python -m benchmarks.simulation_steps [--steps 20000] [--book-field-steps 2000]
+                                             [--output simulation_benchmark.json]
+"""
+
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import json
+import platform
+import time
+
+from benchmarks.render_levels import git_commit, SCREEN_SIZE, TICK
+from others import ControlsType, TileType
+from simulation import LevelSimulation
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (control, press step, release step) repeated every SCRIPT_PERIOD steps for every player
+SCRIPT_PERIOD = 240
+INPUT_SCRIPT: list[tuple[ControlsType, int, int]] = [
+    (ControlsType.RIGHT, 0, 110),
+    (ControlsType.LEFT, 120, 230),
+    (ControlsType.JUMP, 40, 41),
+    (ControlsType.JUMP, 160, 161),
+]
+
+
+def apply_inputs(simulation: LevelSimulation, step: int) -> None:
+    phase = step % SCRIPT_PERIOD
+    for control, press, release in INPUT_SCRIPT:
+        if phase == press:
+            for player in simulation.players:
+                player.press(control)
+        elif phase == release:
+            for player in simulation.players:
+                player.release(control)
+
+
+def book_field(width: int, height: int) -> list[list[TileType]]:
+    """A level with a floor every third row and a book stack on most other tiles."""
+    grid = [[TileType.EMPTY] * width for _ in range(height)]
+    for y in range(height):
+        for x in range(width):
+            if y % 3 == 2:
+                grid[y][x] = TileType.FLOOR if x % 7 else TileType.EMPTY
+            elif (x + y) % 3:
+                grid[y][x] = TileType.BOOKS
+    grid[0][0] = TileType.BLUE_PLAYER
+    grid[0][width - 1] = TileType.RED_PLAYER
+    return grid
+
+
+def snack_field(width: int, height: int, snacks: bool) -> list[list[TileType]]:
+    """A level with a floor every third row and, optionally, a snack on every other tile."""
+    fill = TileType.SNACK if snacks else TileType.EMPTY
+    grid = [
+        [TileType.FLOOR if y % 3 == 2 else fill for _ in range(width)]
+        for y in range(height)
+    ]
+    grid[0][0] = TileType.BLUE_PLAYER
+    grid[0][width - 1] = TileType.RED_PLAYER
+    return grid
+
+
+def run_simulation(load, steps: int) -> dict:
+    simulation = load()
+    completions = 0
+    started = time.perf_counter()
+    for step in range(steps):
+        apply_inputs(simulation, step)
+        simulation.step(TICK)
+        if simulation.complete:
+            completions += 1
+            simulation = load()
+    elapsed = time.perf_counter() - started
+    return {
+        "name": simulation.name,
+        "books": len(simulation.books),
+        "snacks": len(simulation.snack_tiles),
+        "steps": steps,
+        "completions": completions,
+        "seconds": elapsed,
+        "steps_per_second": steps / elapsed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = __doc__.splitlines()[0])
+    parser.add_argument("--steps", type = int, default = 20000)
+    parser.add_argument("--book-field-steps", type = int, default = 2000)
+    parser.add_argument("--levels", default = "levels")
+    parser.add_argument("--output", default = "simulation_benchmark.json")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    results: dict = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "tick_seconds": TICK,
+        },
+        "levels": {},
+    }
+
+    level_files = sorted(file for file in os.listdir(args.levels) if file.endswith(".json"))
+    for level_file in level_files:
+        level_path = os.path.join(args.levels, level_file)
+        level = run_simulation(
+            lambda: LevelSimulation.from_file(level_path, SCREEN_SIZE), args.steps
+        )
+        results["levels"][level_file] = level
+        print(f"{level_file:<32} {level['steps_per_second']:10.0f} steps/s")
+
+    field_size = (60, 30)
+    bounds = (field_size[0] * 64, field_size[1] * 64)
+    for engine, vectorized in (("python", False), ("numpy", True)):
+        name = f"book_field_{engine}"
+        level = run_simulation(
+            lambda: LevelSimulation(book_field(*field_size), bounds, name, vectorized),
+            args.book_field_steps
+        )
+        results["levels"][name] = level
+        print(f"{name:<32} {level['steps_per_second']:10.0f} steps/s ({level['books']} books)")
+
+    for name, snacks in (("empty_field", False), ("snack_field", True)):
+        level = run_simulation(
+            lambda: LevelSimulation(snack_field(*field_size, snacks), bounds, name),
+            args.steps
+        )
+        results["levels"][name] = level
+        print(f"{name:<32} {level['steps_per_second']:10.0f} steps/s ({level['snacks']} snacks)")
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
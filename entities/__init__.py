@@ -1,4 +1,5 @@
-from .player import Player, Facing
+from simulation import Facing
+from .player import Player
 from .snack import Snack
 from .books import MovableBooks
 from .button import Button
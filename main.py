@@ -1,17 +1,48 @@
 """Main entry point for the game."""
 
+import os
 from typing import Callable
 
 import pygame
 from pygame.surface import Surface
 from pygame.font import Font
 
-from screens import MainMenu, LevelBuilder, LevelSelect, Leaderboard, GameScreen, BaseScreen
-from others import Assets
+import screens
+from screens.interface import BaseScreen
+from others import Assets, INVALIDATE_EVENT, attempt_writer
 
-def main() -> None:
-    """Initializes and runs the game loop."""
-    pygame.init()
+MAX_FRAME_TIME = 0.25
+
+def _merge_rects(rects: list[pygame.Rect], bounds: pygame.Rect) -> list[pygame.Rect]:
+    """Clips the rects to the screen and unions the overlapping ones."""
+    merged: list[pygame.Rect] = []
+    for rect in rects:
+        rect = rect.clip(bounds)
+        if rect.width == 0 or rect.height == 0:
+            continue
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+def main(max_frames: int | None = None) -> None:
+    """Initializes and runs the game loop.
+
+    With FAST_START=1 only the display and font subsystems are initialized and
+    screens, images and the game screen are created when they are first needed.
+    max_frames stops the loop after that many presented frames (used by benchmarks).
+    Screens are updated in fixed steps of 1/TICK_RATE seconds (60 by default) and
+    drawn interpolated between the last two steps.
+    """
+    fast_start: bool = os.getenv("FAST_START") == "1"
+    if fast_start:
+        pygame.display.init()
+        pygame.font.init()
+    else:
+        pygame.init()
     screen_width: int = 960
     screen_height: int = 960
     screen: Surface = pygame.display.set_mode((screen_width, screen_height))
@@ -20,41 +51,89 @@ def main() -> None:
     font_main: Font = pygame.font.Font(None, 48)
     font_small: Font = pygame.font.Font(None, 24)
     assets: Assets = Assets()
+    if not fast_start:
+        assets.preload()
+    dirty_rendering: bool = os.getenv("DIRTY_RECTS") == "1"
+    step: float = 1 / int(os.getenv("TICK_RATE", "60"))
 
-    actions: dict[str | tuple | None , Callable[[], BaseScreen]] = {
-        "mainMenu": lambda: MainMenu(font_main, font_small, assets),
-        "levelBuilder": lambda: LevelBuilder(font_main, font_small, assets),
-        "levelSelect": lambda: LevelSelect(font_main, font_small, assets),
-        "leaderboard": lambda: Leaderboard(font_main, font_small, assets),
+    actions: dict[str, Callable[[], BaseScreen]] = {
+        "mainMenu": lambda: screens.MainMenu(font_main, font_small, assets),
+        "levelBuilder": lambda: screens.LevelBuilder(font_main, font_small, assets),
+        "levelSelect": lambda: screens.LevelSelect(font_main, font_small, assets),
+        "leaderboard": lambda: screens.Leaderboard(font_main, font_small, assets),
     }
+    screen_pool: "screens.ScreenPool" = screens.ScreenPool(actions)
 
-    game_screen: GameScreen = GameScreen(font_main, font_small, assets)
-    current_screen: BaseScreen = actions["mainMenu"]()
+    game_screen: "screens.GameScreen | None" = None
+    if not fast_start:
+        game_screen = screens.GameScreen(font_main, font_small, assets)
+    current_screen: BaseScreen = screen_pool.get("mainMenu")
 
     running: bool = True
+    screen_changed: bool = True
+    frame_count: int = 0
+    frame_time: float = 0.0
+    accumulator: float = 0.0
     while running:
-        delta_time: float = clock.tick(60) / 1000.0
-
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
                 continue
 
+            if event.type == INVALIDATE_EVENT:
+                screen_pool.invalidate(event.reason)
+                continue
+
             action = current_screen.handle_event(event)
 
             if action == "quit":
                 running = False
-            elif action in actions:
-                current_screen = actions[action]()
+            elif action in screen_pool:
+                current_screen.on_exit()
+                current_screen = screen_pool.get(action)
+                screen_changed = True
             elif isinstance(action, tuple) and action[0] == "playLevel":
+                current_screen.on_exit()
+                if game_screen is None:
+                    game_screen = screens.GameScreen(font_main, font_small, assets)
                 game_screen.load_level(action[1])
                 current_screen = game_screen
+                screen_changed = True
+
+        # a long stall is dropped instead of being caught up step by step
+        accumulator += min(frame_time, MAX_FRAME_TIME)
+        while accumulator >= step:
+            current_screen.update(step)
+            accumulator -= step
+        current_screen.set_interpolation(accumulator / step)
+
+        dirty_rects = current_screen.get_dirty_rects() if dirty_rendering else None
+        if dirty_rects is None or screen_changed:
+            screen.blit(assets.wall, (0, 0))
+            current_screen.draw(screen)
+            pygame.display.flip()
+        else:
+            dirty_rects = _merge_rects(dirty_rects, screen.get_rect())
+            if dirty_rects:
+                # one draw clipped to the union, the screen's pipeline runs once per frame
+                area = dirty_rects[0].unionall(dirty_rects[1:])
+                screen.set_clip(area)
+                screen.blit(assets.wall, area, area)
+                current_screen.draw(screen)
+                screen.set_clip(None)
+                pygame.display.update(dirty_rects)
+        screen_changed = False
+
+        frame_count += 1
+        if max_frames is not None and frame_count >= max_frames:
+            running = False
 
-        current_screen.update(delta_time)
-        screen.blit(assets.wall, (0, 0))
-        current_screen.draw(screen)
-        pygame.display.flip()
+        # pace after presenting so the first frame is shown without waiting
+        frame_time = clock.tick(60) / 1000.0
 
+    current_screen.on_exit()
+    # attempts still queued for the history writer are written before exiting
+    attempt_writer.close()
     pygame.quit()
 
 
@@ -3,8 +3,13 @@ from .controls_type import ControlsType
 from .floor_type import FloorType
 from .global_values import current_team_name
 from .graphics_loader import Assets
-from .level_history_manager import LevelHistoryManager
+from .invalidation_type import InvalidationType, INVALIDATE_EVENT, post_invalidation
+from .level_history_manager import LevelHistoryManager, shared_history
+from .history_store import SqliteHistoryStore, open_history
+from .history_writer import HistoryWriter, attempt_writer
+from .pose_type import PoseType
 from .spray_type import SprayType
+from .text_cache import render_text, clear_text_cache
 from .text_input import TextInputBox
 from .tile_type import TileType
 
@@ -14,8 +19,19 @@ __all__ = [
     "FloorType",
     "current_team_name",
     "Assets",
+    "InvalidationType",
+    "INVALIDATE_EVENT",
+    "post_invalidation",
     "LevelHistoryManager",
+    "shared_history",
+    "SqliteHistoryStore",
+    "open_history",
+    "HistoryWriter",
+    "attempt_writer",
+    "PoseType",
     "SprayType",
+    "render_text",
+    "clear_text_cache",
     "TextInputBox",
     "TileType"
 ]
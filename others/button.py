@@ -4,6 +4,8 @@ from typing import Callable, Optional, Tuple
 import pygame
 from pygame.surface import Surface
 
+from others.text_cache import render_text
+
 
 class Button:
     def __init__(
@@ -26,7 +28,7 @@ class Button:
         self.background_color: pygame.Color = background_color
         self.show_check: bool = show_check
         self.check_image: Optional[Surface] = check_image
-        self.rendered_label: Surface = self.font.render(self.label, True, self.text_color)
+        self.rendered_label: Surface = render_text(self.font, self.label, self.text_color)
 
     def handle_event(self, event: pygame.event.Event) -> None:
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
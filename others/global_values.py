@@ -1 +1,4 @@
+import os
+
 current_team_name = ""
+debug_mode = os.getenv("DEBUG") == "1"
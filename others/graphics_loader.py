@@ -1,57 +1,119 @@
+from functools import cached_property
+
 import pygame
 from pygame.surface import Surface
 
 from others.tile_type import TileType
 from others.floor_type import FloorType
 from others.spray_type import SprayType
+from others.pose_type import PoseType
+from others.texture_atlas import TextureAtlas, load_scaled
 
 tileSize = 64
 
+TILE = (tileSize, tileSize)
+TILE_2X1 = (2 * tileSize, tileSize)
+
+ATLAS_SOURCES: dict[str, tuple[int, int]] = {
+    "graphics/levels/floor.png": TILE,
+    "graphics/levels/floor_left.png": TILE,
+    "graphics/levels/floor_right.png": TILE,
+    "graphics/levels/floor_both.png": TILE,
+    "graphics/players/playerBlue.png": TILE,
+    "graphics/players/playerRed.png": TILE,
+    "graphics/players/bedBlue.png": TILE_2X1,
+    "graphics/players/bedRed.png": TILE_2X1,
+    "graphics/entities/snack.png": TILE,
+    "graphics/entities/books.png": TILE,
+    "graphics/spray/button.png": TILE,
+    "graphics/spray/button_pressed.png": TILE,
+    "graphics/spray/spray_off.png": TILE,
+    "graphics/spray/spray_on.png": TILE,
+    "graphics/spray/spray_on_bottom.png": TILE,
+    "graphics/spray/spray_on_middle.png": TILE,
+    "graphics/spray/spray_on_top.png": TILE,
+    "graphics/levels/levelPassed.png": TILE,
+}
+
 class Assets:
-    def __init__(self) -> None:
-        self.floor_variants: dict[FloorType, Surface] = {
-            FloorType.MID: self._load64("graphics/levels/floor.png"),
-            FloorType.LEFT: self._load64("graphics/levels/floor_left.png"),
-            FloorType.RIGHT: self._load64("graphics/levels/floor_right.png"),
-            FloorType.FLOOR_SINGLE: self._load64("graphics/levels/floor_both.png"),
+    """Game images, loaded on first use so screens that need none of them start instantly."""
+
+    def preload(self) -> None:
+        for name in (
+            "floor_variants", "player_images", "player_poses", "beds", "entities",
+            "sprays", "button_pressed", "wall", "passed_level_image",
+        ):
+            getattr(self, name)
+
+    @cached_property
+    def atlas(self) -> TextureAtlas:
+        return TextureAtlas(ATLAS_SOURCES)
+
+    @cached_property
+    def floor_variants(self) -> dict[FloorType, Surface]:
+        return {
+            FloorType.MID: self._tile("graphics/levels/floor.png"),
+            FloorType.LEFT: self._tile("graphics/levels/floor_left.png"),
+            FloorType.RIGHT: self._tile("graphics/levels/floor_right.png"),
+            FloorType.FLOOR_SINGLE: self._tile("graphics/levels/floor_both.png"),
+        }
+
+    @cached_property
+    def player_images(self) -> dict[TileType, Surface]:
+        return {
+            TileType.BLUE_PLAYER: self._tile("graphics/players/playerBlue.png"),
+            TileType.RED_PLAYER:  self._tile("graphics/players/playerRed.png"),
         }
 
-        self.player_images: dict[TileType, Surface] = {
-            TileType.BLUE_PLAYER: self._load64("graphics/players/playerBlue.png"),
-            TileType.RED_PLAYER:  self._load64("graphics/players/playerRed.png"),
+    @cached_property
+    def player_poses(self) -> dict[TileType, dict[PoseType, Surface]]:
+        return {
+            tile_type: self._make_poses(image) for tile_type, image in self.player_images.items()
         }
 
-        self.beds: dict[TileType, Surface] = {
-            TileType.BLUE_BED: self._load_2x1("graphics/players/bedBlue.png"),
-            TileType.RED_BED:  self._load_2x1("graphics/players/bedRed.png"),
+    @cached_property
+    def beds(self) -> dict[TileType, Surface]:
+        return {
+            TileType.BLUE_BED: self._tile("graphics/players/bedBlue.png"),
+            TileType.RED_BED:  self._tile("graphics/players/bedRed.png"),
         }
 
-        self.entities: dict[TileType, Surface] = {
-            TileType.SNACK: self._load64("graphics/entities/snack.png"),
-            TileType.BOOKS: self._load64("graphics/entities/books.png"),
-            TileType.BUTTON: self._load64("graphics/spray/button.png"),
+    @cached_property
+    def entities(self) -> dict[TileType, Surface]:
+        return {
+            TileType.SNACK: self._tile("graphics/entities/snack.png"),
+            TileType.BOOKS: self._tile("graphics/entities/books.png"),
+            TileType.BUTTON: self._tile("graphics/spray/button.png"),
         }
 
-        self.sprays: dict[SprayType, Surface] = {
-            SprayType.OFF:       self._load64("graphics/spray/spray_off.png"),
-            SprayType.ON:        self._load64("graphics/spray/spray_on.png"),
-            SprayType.ON_BOTTOM: self._load64("graphics/spray/spray_on_bottom.png"),
-            SprayType.ON_MIDDLE: self._load64("graphics/spray/spray_on_middle.png"),
-            SprayType.ON_TOP:    self._load64("graphics/spray/spray_on_top.png")
+    @cached_property
+    def sprays(self) -> dict[SprayType, Surface]:
+        return {
+            SprayType.OFF:       self._tile("graphics/spray/spray_off.png"),
+            SprayType.ON:        self._tile("graphics/spray/spray_on.png"),
+            SprayType.ON_BOTTOM: self._tile("graphics/spray/spray_on_bottom.png"),
+            SprayType.ON_MIDDLE: self._tile("graphics/spray/spray_on_middle.png"),
+            SprayType.ON_TOP:    self._tile("graphics/spray/spray_on_top.png")
         }
 
-        self.button_pressed: Surface = self._load64("graphics/spray/button_pressed.png")
-        self.wall: Surface = self._load_original("graphics/levels/wall.png")
-        self.wall = pygame.transform.scale(self.wall, pygame.display.get_surface().get_size())
-        self.passed_level_image: Surface = self._load64("graphics/levels/levelPassed.png")
+    @cached_property
+    def button_pressed(self) -> Surface:
+        return self._tile("graphics/spray/button_pressed.png")
 
-    def _load64(self, path: str) -> Surface:
-        img = pygame.image.load(path).convert_alpha()
-        return pygame.transform.scale(img, (tileSize, tileSize))
+    @cached_property
+    def wall(self) -> Surface:
+        return load_scaled("graphics/levels/wall.png", pygame.display.get_surface().get_size())
 
-    def _load_2x1(self, path: str) -> Surface:
-        img = pygame.image.load(path).convert_alpha()
-        return pygame.transform.scale(img, (2 * tileSize, tileSize))
+    @cached_property
+    def passed_level_image(self) -> Surface:
+        return self._tile("graphics/levels/levelPassed.png")
+
+    def _make_poses(self, image: Surface) -> dict[PoseType, Surface]:
+        return {
+            PoseType.LEFT: image,
+            PoseType.RIGHT: pygame.transform.flip(image, True, False),
+            PoseType.SLEEPING: pygame.transform.rotate(image, 270),
+        }
 
-    def _load_original(self, path: str) -> Surface:
-        return pygame.image.load(path).convert()
+    def _tile(self, path: str) -> Surface:
+        return self.atlas.get(path)
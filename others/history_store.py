@@ -0,0 +1,220 @@
+"""Attempt history in SQLite, and the choice between it and the JSON history.
+
+Usage: python -m others.history_store [JSON] [DB]
+
+Copies the JSON history (history.json) into a new SQLite database (history.db).
+"""
+
+import argparse
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from .level_history_manager import LevelHistoryManager, shared_history
+
+HISTORY_BACKEND = os.getenv("HISTORY_BACKEND", "json")
+SORT_COLUMNS = ("team", "level", "time", "points", "timestamp")
+
+# one SqliteHistoryStore per database, shared by every screen and the history writer
+_shared: dict[str, "SqliteHistoryStore"] = {}
+_shared_lock = threading.Lock()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY,
+    team TEXT NOT NULL,
+    level TEXT NOT NULL,
+    time REAL NOT NULL,
+    points INTEGER NOT NULL,
+    timestamp TEXT NOT NULL,
+    replay TEXT
+);
+CREATE INDEX IF NOT EXISTS attempts_team_level ON attempts (team, level);
+CREATE INDEX IF NOT EXISTS attempts_level_time ON attempts (level, time);
+CREATE INDEX IF NOT EXISTS attempts_time ON attempts (time);
+CREATE INDEX IF NOT EXISTS attempts_points ON attempts (points);
+CREATE INDEX IF NOT EXISTS attempts_timestamp ON attempts (timestamp);
+"""
+
+
+class SqliteHistoryStore:
+    """Attempt history in an indexed SQLite table, with the LevelHistoryManager API.
+
+    When the database doesn't exist yet and json_path does, the JSON history
+    is copied into a temporary database that only replaces db_path once the
+    copy succeeded, so a failed copy is tried again on the next open. The
+    connection may be used from any thread, lock keeps one query at a time
+    on it.
+    """
+
+    def __init__(self, db_path = "history.db", json_path = None):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        if not os.path.exists(db_path) and json_path is not None and os.path.exists(json_path):
+            _build_migrated(db_path, json_path)
+        self.connection = sqlite3.connect(db_path, check_same_thread = False)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def _fetch(self, query, parameters = ()):
+        with self.lock:
+            return self.connection.execute(query, parameters).fetchall()
+
+    def _insert(self, rows):
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "INSERT INTO attempts (team, level, time, points, timestamp, replay)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def migrate_json(self, json_path):
+        """Copies every attempt of a JSON history into the table."""
+        data = LevelHistoryManager(json_path).data
+        rows = [
+            (
+                team_name,
+                level_name,
+                attempt.get("time", 0),
+                attempt.get("points", 0),
+                attempt.get("timestamp", ""),
+                attempt.get("replay"),
+            )
+            for team_name, team in data["teams"].items()
+            for level_name, attempts in team["completed_levels"].items()
+            for attempt in attempts
+        ]
+        self._insert(rows)
+
+    def record_attempt(self, team_name, level_name, time, points, replay = None):
+        self.record_attempts([{
+            "team": team_name,
+            "level": level_name,
+            "time": time,
+            "points": points,
+            "timestamp": datetime.now().isoformat(),
+            "replay": replay
+        }])
+
+    def record_attempts(self, attempts):
+        """Inserts attempts, dicts with a "team" and "level" key, in one transaction."""
+        self._insert([
+            (
+                attempt["team"],
+                attempt["level"],
+                attempt["time"],
+                attempt["points"],
+                attempt["timestamp"],
+                attempt.get("replay"),
+            )
+            for attempt in attempts
+        ])
+
+    def has_completed(self, team_name, level_name):
+        return bool(self._fetch(
+            "SELECT 1 FROM attempts WHERE team = ? AND level = ? LIMIT 1",
+            (team_name, level_name)
+        ))
+
+    def completed_levels(self, team_name):
+        return {
+            level for (level,) in self._fetch(
+                "SELECT DISTINCT level FROM attempts WHERE team = ?", (team_name,)
+            )
+        }
+
+    def best_time(self, level_name):
+        return self._fetch(
+            "SELECT MIN(time) FROM attempts WHERE level = ?", (level_name,)
+        )[0][0]
+
+    def best_replay(self, level_name):
+        """Returns the replay path of the fastest attempt at the level that has one."""
+        rows = self._fetch(
+            "SELECT replay FROM attempts WHERE level = ? AND replay IS NOT NULL"
+            " ORDER BY time LIMIT 1",
+            (level_name,)
+        )
+        return rows[0][0] if rows else None
+
+    def get_attempts(self, team_name, level_name):
+        attempts = []
+        for time, points, timestamp, replay in self._fetch(
+            "SELECT time, points, timestamp, replay FROM attempts"
+            " WHERE team = ? AND level = ? ORDER BY id",
+            (team_name, level_name)
+        ):
+            attempt = {"time": time, "points": points, "timestamp": timestamp}
+            if replay is not None:
+                attempt["replay"] = replay
+            attempts.append(attempt)
+        return attempts
+
+    def count(self):
+        return self._fetch("SELECT COUNT(*) FROM attempts")[0][0]
+
+    def page(self, sort_key, ascending, offset, limit):
+        """Returns limit leaderboard entries from offset on, sorted by one of SORT_COLUMNS."""
+        if sort_key not in SORT_COLUMNS:
+            raise ValueError(f"can't sort by {sort_key}")
+        direction = "ASC" if ascending else "DESC"
+        rows = self._fetch(
+            "SELECT team, level, time, points, timestamp FROM attempts"
+            f" ORDER BY {sort_key} {direction}, id {direction} LIMIT ? OFFSET ?",
+            (limit, offset)
+        )
+        return [
+            {"team": team, "level": level, "time": time, "points": points, "timestamp": timestamp}
+            for team, level, time, points, timestamp in rows
+        ]
+
+
+def _build_migrated(db_path, json_path):
+    """Raises OSError, json.JSONDecodeError or sqlite3.Error when the copy fails."""
+    temporary_path = f"{db_path}.tmp"
+    if os.path.exists(temporary_path):
+        os.remove(temporary_path)
+    store = SqliteHistoryStore(temporary_path)
+    try:
+        store.migrate_json(json_path)
+    finally:
+        store.close()
+    os.replace(temporary_path, db_path)
+
+
+def open_history(json_path = "history.json"):
+    """Opens the history backend picked by HISTORY_BACKEND, "json" or "sqlite".
+
+    The SQLite database sits next to json_path, with a .db extension, and is
+    opened once per process. The JSON history is the process-wide one from
+    shared_history, so it is only parsed again after something else changed
+    the file.
+    """
+    if HISTORY_BACKEND == "sqlite":
+        db_path = os.path.abspath(os.path.splitext(json_path)[0] + ".db")
+        with _shared_lock:
+            if db_path not in _shared:
+                _shared[db_path] = SqliteHistoryStore(db_path, json_path)
+            return _shared[db_path]
+    return shared_history(json_path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = __doc__.splitlines()[0])
+    parser.add_argument("json_path", nargs = "?", default = "history.json")
+    parser.add_argument("db_path", nargs = "?", default = "history.db")
+    args = parser.parse_args()
+
+    if os.path.exists(args.db_path):
+        parser.error(f"{args.db_path} already exists")
+    _build_migrated(args.db_path, args.json_path)
+    store = SqliteHistoryStore(args.db_path)
+    print(f"Copied {store.count()} attempts to {args.db_path}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
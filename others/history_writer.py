@@ -0,0 +1,119 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+from datetime import datetime
+
+import pygame
+
+from .history_store import open_history
+from .invalidation_type import InvalidationType, post_invalidation
+
+# attempts waiting to be written before record_attempt stops queueing
+MAX_PENDING = 64
+# seconds record_attempt waits for room in a full queue before writing the attempt itself
+FULL_QUEUE_WAIT = 0.05
+
+
+class HistoryWriter:
+    """Writes attempts and their replays on a background thread.
+
+    record_attempt only puts the attempt on a bounded queue, so the frame
+    loop doesn't wait for the disk. Only when the thread is so far behind
+    that the queue stays full does the caller write the attempt itself,
+    rather than lose a completed run. The thread writes everything that queued
+    up while it was busy as one group, with one log write or transaction
+    per history file. The HISTORY invalidation is posted once the attempts
+    are on disk, so screens never reload a history that misses them.
+    """
+
+    def __init__(self, max_pending = MAX_PENDING):
+        self.pending = queue.Queue(max_pending)
+        self.thread = None
+
+    def record_attempt(
+            self, history_path, team_name, level_name, time, points,
+            replay = None, recording = None
+        ):
+        """Queues an attempt. A recording is saved to the replay path before it is recorded."""
+        if self.thread is None:
+            self.thread = threading.Thread(
+                target = self._run, name = "history-writer", daemon = True
+            )
+            self.thread.start()
+        attempt = {
+            "team": team_name,
+            "level": level_name,
+            "time": time,
+            "points": points,
+            "timestamp": datetime.now().isoformat()
+        }
+        if replay is not None:
+            attempt["replay"] = replay
+        job = (history_path, attempt, recording)
+        try:
+            self.pending.put(job, timeout = FULL_QUEUE_WAIT)
+        except queue.Full:
+            print(f"History writer is behind, writing the attempt at {level_name} directly")
+            self._write([job])
+
+    def flush(self):
+        """Waits until every queued attempt is written."""
+        if self.thread is not None:
+            self.pending.join()
+
+    def close(self):
+        """Writes the queued attempts and stops the thread."""
+        if self.thread is not None:
+            self.pending.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def _run(self):
+        while True:
+            group = [self.pending.get()]
+            while True:
+                try:
+                    group.append(self.pending.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in group
+            self._write([job for job in group if job is not None])
+            for _ in group:
+                self.pending.task_done()
+            if stop:
+                return
+
+    def _write(self, jobs):
+        attempts = {}
+        for history_path, attempt, recording in jobs:
+            if recording is not None and not _save_replay(recording, attempt["replay"]):
+                del attempt["replay"]
+            attempts.setdefault(history_path, []).append(attempt)
+
+        for history_path, group in attempts.items():
+            try:
+                history = open_history(history_path)
+                history.record_attempts(group)
+            except (OSError, json.JSONDecodeError, sqlite3.Error) as exception:
+                print(f"Failed to record {len(group)} attempts in {history_path}: {exception}")
+        if attempts:
+            try:
+                post_invalidation(InvalidationType.HISTORY)
+            except pygame.error:
+                # the display is already closed during shutdown
+                pass
+
+
+def _save_replay(recording, path):
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok = True)
+        recording.save(path)
+    except OSError as exception:
+        print(f"Failed to save replay {path}: {exception}")
+        return False
+    return True
+
+
+attempt_writer = HistoryWriter()
@@ -0,0 +1,13 @@
+from enum import Enum
+
+import pygame
+
+class InvalidationType(Enum):
+    HISTORY = 0
+    LEVELS = 1
+
+INVALIDATE_EVENT: int = pygame.event.custom_type()
+
+def post_invalidation(reason: InvalidationType) -> None:
+    """Tells the main loop that data cached by pooled screens has changed."""
+    pygame.event.post(pygame.event.Event(INVALIDATE_EVENT, reason = reason))
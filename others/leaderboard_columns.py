@@ -0,0 +1,50 @@
+import numpy
+
+COLUMNS = ("team", "level", "time", "points", "timestamp")
+
+
+class LeaderboardColumns:
+    """Every attempt of a history as NumPy columns, with a sort order per column.
+
+    The order of a column is a stable argsort made the first time the column
+    is sorted by. Descending is the same array read backwards, so switching
+    columns or direction afterwards costs nothing. Rows are only turned into
+    dicts for the page that is asked for.
+    """
+
+    def __init__(self, data: dict) -> None:
+        teams, levels, times, points, timestamps = [], [], [], [], []
+        for team_name, team in data["teams"].items():
+            for level_name, attempts in team["completed_levels"].items():
+                teams.extend([team_name] * len(attempts))
+                levels.extend([level_name] * len(attempts))
+                for attempt in attempts:
+                    times.append(attempt.get("time", 0))
+                    points.append(attempt.get("points", 0))
+                    timestamps.append(attempt.get("timestamp", ""))
+        self.columns: dict[str, numpy.ndarray] = {
+            "team": numpy.array(teams, dtype = str),
+            "level": numpy.array(levels, dtype = str),
+            "time": numpy.array(times, dtype = numpy.float64),
+            "points": numpy.array(points, dtype = numpy.int64),
+            "timestamp": numpy.array(timestamps, dtype = str),
+        }
+        self.orders: dict[str, numpy.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.columns["time"])
+
+    def order(self, sort_key: str, ascending: bool) -> numpy.ndarray:
+        if sort_key not in self.orders:
+            self.orders[sort_key] = numpy.argsort(self.columns[sort_key], kind = "stable")
+        order = self.orders[sort_key]
+        return order if ascending else order[::-1]
+
+    def page(self, sort_key: str, ascending: bool, offset: int, limit: int) -> list[dict]:
+        """Returns limit entries from offset on, sorted by sort_key."""
+        rows = self.order(sort_key, ascending)[offset:offset + limit]
+        values = {name: column[rows].tolist() for name, column in self.columns.items()}
+        return [
+            {name: values[name][index] for name in COLUMNS}
+            for index in range(len(rows))
+        ]
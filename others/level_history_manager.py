@@ -1,31 +1,150 @@
 import json
 import os
+import threading
 from datetime import datetime
 
+# appended attempts are folded into the snapshot once the log holds this many
+COMPACT_AFTER = 200
+
+# one LevelHistoryManager per history file, shared by every screen and the history writer
+_shared: dict[str, "LevelHistoryManager"] = {}
+_shared_lock = threading.Lock()
+
 class LevelHistoryManager:
+    """Attempt history kept as a JSON snapshot plus an append-only JSON Lines log.
+
+    record_attempt appends one line to the log, so its cost doesn't grow with
+    the history. Every COMPACT_AFTER attempts the log is folded into the
+    snapshot. The log starts with the generation of the snapshot it extends,
+    so a log that was already folded in before a crash is not read twice.
+
+    lock guards data, so the history writer thread can record while the
+    screens read. write_lock keeps writes to the files in order without
+    holding lock during the disk I/O.
+    """
+
     def __init__(self, file_path = "history.json"):
         self.file_path = file_path
-        self.data = self._load()
+        self.log_path = f"{file_path}.log"
+        self.generation = 0
+        self.logged = 0
+        self.torn_line = False
+        self.data = {"teams": {}}
+        # LeaderboardColumns of the attempts, dropped when an attempt is added
+        self.columns = None
+        self.lock = threading.RLock()
+        self.write_lock = threading.Lock()
+        self._load()
+        # the files as this manager last read or wrote them
+        self.signature = self._file_signature()
+
+    def _file_signature(self):
+        signature = []
+        for path in (self.file_path, self.log_path):
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
 
     def _load(self):
         if os.path.exists(self.file_path):
             with open(self.file_path, "r", encoding="utf-8") as file:
-                return json.load(file)
-        return {"teams": {}}
+                self.data = json.load(file)
+        self.generation = self.data.pop("log_generation", 0)
+        if os.path.exists(self.log_path):
+            self._replay_log()
 
-    def save(self):
-        with open(self.file_path, "w", encoding="utf-8") as file:
-            json.dump(self.data, file, indent=2)
+    def _replay_log(self):
+        with open(self.log_path, "r", encoding="utf-8") as file:
+            text = file.read()
+        lines = text.splitlines()
+        try:
+            generation = json.loads(lines[0])["generation"] if lines else None
+        except (json.JSONDecodeError, KeyError):
+            generation = None
+        if generation != self.generation:
+            # already folded into the snapshot, or never got past its first line
+            self._remove_log()
+            return
+        # a write cut short by a crash leaves a last line without its newline
+        self.torn_line = not text.endswith("\n")
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            self._add(entry.pop("team"), entry.pop("level"), entry)
+            self.logged += 1
 
-    def record_attempt(self, team_name, level_name, time, points):
+    def _add(self, team_name, level_name, attempt):
         team = self.data["teams"].setdefault(team_name, {"completed_levels": {}})
-        level_attempts = team["completed_levels"].setdefault(level_name, [])
-        level_attempts.append({
+        team["completed_levels"].setdefault(level_name, []).append(attempt)
+        self.columns = None
+
+    def save(self):
+        """Writes everything to a new snapshot and starts an empty log for it."""
+        with self.write_lock:
+            self._save()
+            self.signature = self._file_signature()
+
+    def _save(self):
+        with self.lock:
+            text = json.dumps(dict(self.data, log_generation = self.generation + 1), indent=2)
+        temporary_path = f"{self.file_path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            file.write(text)
+        os.replace(temporary_path, self.file_path)
+        self.generation += 1
+        self.logged = 0
+        self.torn_line = False
+        self._remove_log()
+
+    def _remove_log(self):
+        try:
+            os.remove(self.log_path)
+        except FileNotFoundError:
+            # another manager of the same file got to it first
+            pass
+
+    def record_attempt(self, team_name, level_name, time, points, replay = None):
+        attempt = {
+            "team": team_name,
+            "level": level_name,
             "time": time,
             "points": points,
             "timestamp": datetime.now().isoformat()
-        })
-        self.save()
+        }
+        if replay is not None:
+            attempt["replay"] = replay
+        self.record_attempts([attempt])
+
+    def record_attempts(self, attempts):
+        """Appends attempts, dicts with a "team" and "level" key, to the log in one write."""
+        lines = []
+        with self.write_lock:
+            with self.lock:
+                for attempt in attempts:
+                    attempt = dict(attempt)
+                    team_name, level_name = attempt.pop("team"), attempt.pop("level")
+                    self._add(team_name, level_name, attempt)
+                    lines.append(
+                        json.dumps({"team": team_name, "level": level_name, **attempt}) + "\n"
+                    )
+
+            new_log = not os.path.exists(self.log_path)
+            with open(self.log_path, "a", encoding="utf-8") as file:
+                if self.torn_line:
+                    lines.insert(0, "\n")
+                    self.torn_line = False
+                if new_log:
+                    lines.insert(0, json.dumps({"generation": self.generation}) + "\n")
+                file.write("".join(lines))
+            self.logged += len(attempts)
+            if self.logged >= COMPACT_AFTER:
+                self._save()
+            self.signature = self._file_signature()
 
     def has_completed(self, team_name, level_name):
         return (
@@ -33,7 +152,68 @@ class LevelHistoryManager:
             level_name in self.data["teams"][team_name]["completed_levels"]
         )
 
+    def best_replay(self, level_name):
+        """Returns the replay path of the fastest attempt at the level that has one."""
+        best = None
+        with self.lock:
+            for team in self.data["teams"].values():
+                for attempt in team["completed_levels"].get(level_name, []):
+                    if "replay" in attempt and (best is None or attempt["time"] < best["time"]):
+                        best = attempt
+        return best["replay"] if best is not None else None
+
     def get_attempts(self, team_name, level_name):
         if self.has_completed(team_name, level_name):
             return self.data["teams"][team_name]["completed_levels"][level_name]
         return []
+
+    def completed_levels(self, team_name):
+        with self.lock:
+            return set(self.data["teams"].get(team_name, {}).get("completed_levels", {}))
+
+    def best_time(self, level_name):
+        with self.lock:
+            times = [
+                attempt.get("time", 0)
+                for team in self.data["teams"].values()
+                for attempt in team["completed_levels"].get(level_name, [])
+            ]
+        return min(times, default = None)
+
+    def count(self):
+        with self.lock:
+            return sum(
+                len(attempts)
+                for team in self.data["teams"].values()
+                for attempts in team["completed_levels"].values()
+            )
+
+    def page(self, sort_key, ascending, offset, limit):
+        """Returns limit leaderboard entries from offset on, sorted by sort_key."""
+        with self.lock:
+            if self.columns is None:
+                # NumPy is only imported once the leaderboard is opened, to keep it out of startup
+                from others.leaderboard_columns import LeaderboardColumns
+                self.columns = LeaderboardColumns(self.data)
+            columns = self.columns
+        return columns.page(sort_key, ascending, offset, limit)
+
+
+def shared_history(file_path = "history.json"):
+    """Returns the process-wide LevelHistoryManager of file_path.
+
+    The files are only read again when their modification time or size no
+    longer match what the manager last read or wrote, so attempts recorded
+    through it keep it without a reload.
+    """
+    key = os.path.abspath(file_path)
+    with _shared_lock:
+        manager = _shared.get(key)
+        if manager is None:
+            manager = _shared[key] = LevelHistoryManager(file_path)
+            return manager
+        # a write through the manager in progress would look like an outside change
+        with manager.write_lock:
+            if manager.signature != manager._file_signature():
+                manager = _shared[key] = LevelHistoryManager(file_path)
+        return manager
@@ -0,0 +1,6 @@
+from enum import IntEnum
+
+class PoseType(IntEnum):
+    LEFT = 0
+    RIGHT = 1
+    SLEEPING = 2
@@ -0,0 +1,30 @@
+from functools import lru_cache
+
+import pygame
+from pygame.surface import Surface
+
+TEXT_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize = TEXT_CACHE_SIZE)
+def _render(
+    font: pygame.font.Font,
+    text: str,
+    color: tuple[int, int, int, int],
+    antialias: bool
+) -> Surface:
+    return font.render(text, antialias, color)
+
+
+def render_text(
+    font: pygame.font.Font,
+    text: str,
+    color: pygame.Color | tuple[int, ...] | str,
+    antialias: bool = True
+) -> Surface:
+    """Returns a cached rendering of the text. The surface is shared, so never draw on it."""
+    return _render(font, text, tuple(pygame.Color(color)), antialias)
+
+
+def clear_text_cache() -> None:
+    _render.cache_clear()
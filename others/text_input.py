@@ -1,5 +1,7 @@
 import pygame
 
+from others.text_cache import render_text
+
 
 class TextInputBox:
     def __init__(
@@ -70,7 +72,7 @@ class TextInputBox:
     def draw(self, screen: pygame.Surface) -> None:
         display_label = self.label if self.label or self.active else self.hint
         label_color = self.color_text if self.label else self.color_inactive
-        text_surface = self.font.render(display_label, True, label_color)
+        text_surface = render_text(self.font, display_label, label_color)
         text_x = self.rect.centerx - text_surface.get_width() // 2
         text_y = self.rect.centery - text_surface.get_height() // 2
         screen.blit(text_surface, (text_x, text_y))
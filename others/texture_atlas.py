@@ -0,0 +1,106 @@
+import json
+import os
+
+import pygame
+from pygame.surface import Surface
+
+ATLAS_WIDTH = 512
+CACHE_DIR = ".cache"
+
+
+def load_scaled(path: str, size: tuple[int, int], cache_dir: str = CACHE_DIR) -> Surface:
+    """Loads an opaque image scaled to size, keeping an uncompressed copy of the result on disk."""
+    name = os.path.splitext(os.path.basename(path))[0]
+    cache_path = os.path.join(cache_dir, f"{name}_{size[0]}x{size[1]}.bmp")
+    if (
+        os.path.exists(cache_path)
+        and os.stat(cache_path).st_mtime_ns >= os.stat(path).st_mtime_ns
+    ):
+        return pygame.image.load(cache_path).convert()
+
+    image = pygame.transform.scale(pygame.image.load(path).convert(), size)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        pygame.image.save(image, cache_path)
+    except (OSError, pygame.error) as exception:
+        print(f"Could not write image cache: {exception}")
+    return image
+
+
+class TextureAtlas:
+    """Packs pre-scaled images into one surface that is cached on disk.
+
+    The cache is rebuilt whenever a source image changes (by mtime) or the
+    requested sizes differ from the cached index.
+    """
+
+    def __init__(self, sources: dict[str, tuple[int, int]], cache_dir: str = CACHE_DIR) -> None:
+        self.sources: dict[str, tuple[int, int]] = sources
+        self.image_path: str = os.path.join(cache_dir, "atlas.png")
+        self.index_path: str = os.path.join(cache_dir, "atlas.json")
+        self.rebuilt: bool = False
+
+        stamp = self._stamp()
+        index = self._load_index(stamp)
+        if index is None:
+            image, index = self._build(stamp)
+            self.rebuilt = True
+        else:
+            image = pygame.image.load(self.image_path)
+
+        self.image: Surface = image.convert_alpha()
+        self.regions: dict[str, Surface] = {
+            path: self.image.subsurface(pygame.Rect(rect))
+            for path, rect in index["regions"].items()
+        }
+
+    def get(self, path: str) -> Surface:
+        return self.regions[path]
+
+    def _stamp(self) -> dict[str, list[int]]:
+        return {
+            path: [os.stat(path).st_mtime_ns, width, height]
+            for path, (width, height) in self.sources.items()
+        }
+
+    def _load_index(self, stamp: dict[str, list[int]]) -> dict | None:
+        if not os.path.exists(self.image_path):
+            return None
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as file:
+                index = json.load(file)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if index.get("sources") != stamp:
+            return None
+        return index
+
+    def _pack(self) -> tuple[dict[str, list[int]], int]:
+        regions: dict[str, list[int]] = {}
+        x = y = shelf_height = 0
+        for path, (width, height) in self.sources.items():
+            if x + width > ATLAS_WIDTH:
+                x = 0
+                y += shelf_height
+                shelf_height = 0
+            regions[path] = [x, y, width, height]
+            x += width
+            shelf_height = max(shelf_height, height)
+        return regions, y + shelf_height
+
+    def _build(self, stamp: dict[str, list[int]]) -> tuple[Surface, dict]:
+        regions, atlas_height = self._pack()
+        atlas = pygame.Surface((ATLAS_WIDTH, max(atlas_height, 1)), pygame.SRCALPHA)
+        for path, (x, y, width, height) in regions.items():
+            image = pygame.image.load(path).convert_alpha()
+            atlas.blit(pygame.transform.scale(image, (width, height)), (x, y))
+
+        index = {"sources": stamp, "regions": regions}
+        try:
+            os.makedirs(os.path.dirname(self.image_path) or ".", exist_ok=True)
+            pygame.image.save(atlas, self.image_path)
+            with open(self.index_path, "w", encoding="utf-8") as file:
+                json.dump(index, file, indent=2)
+        except (OSError, pygame.error) as exception:
+            print(f"Could not write texture atlas cache: {exception}")
+        return atlas, index
@@ -1,9 +1,15 @@
-from .main_menu import MainMenu
-from .level_builder import LevelBuilder
-from .level_selector import LevelSelect
-from .leaderboard import Leaderboard
-from .gameplay import GameScreen
-from .interface import BaseScreen
+from importlib import import_module
+
+# screens are imported on first use so that startup only pays for the main menu
+_SCREEN_MODULES = {
+    "MainMenu": ".main_menu",
+    "LevelBuilder": ".level_builder",
+    "LevelSelect": ".level_selector",
+    "Leaderboard": ".leaderboard",
+    "GameScreen": ".gameplay",
+    "BaseScreen": ".interface",
+    "ScreenPool": ".screen_pool",
+}
 
 __all__ = [
     "MainMenu",
@@ -11,5 +17,12 @@ __all__ = [
     "LevelSelect",
     "Leaderboard",
     "GameScreen",
-    "BaseScreen"
+    "BaseScreen",
+    "ScreenPool"
 ]
+
+
+def __getattr__(name: str):
+    if name not in _SCREEN_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_SCREEN_MODULES[name], __name__), name)
@@ -1,14 +1,44 @@
 import json
+import os
+import time
+from datetime import datetime
+
 import pygame
 
 import others
-from others import TileType, FloorType, ControlsType, LevelHistoryManager, Assets
+from others import (
+    TileType,
+    FloorType,
+    ControlsType,
+    PoseType,
+    open_history,
+    Assets,
+    attempt_writer,
+    render_text,
+)
 from entities import Player, Snack, MovableBooks, Button, Spray
+from simulation import LevelSimulation, SnackBody, InputRecording, GhostStore, level_digest
 from screens.interface import BaseScreen
 
 TILE_SIZE: int = 64
 POPUP_WIDTH: int = 400
 POPUP_HEIGHT: int = 200
+REPLAYS_DIR: str = "replays"
+GHOSTS_DIR: str = os.path.join(".cache", "ghosts")
+GHOST_ALPHA: int = 90
+
+PLAYER_CONTROLS: dict[TileType, dict[ControlsType, int]] = {
+    TileType.BLUE_PLAYER: {
+        ControlsType.LEFT: pygame.K_a,
+        ControlsType.RIGHT: pygame.K_d,
+        ControlsType.JUMP: pygame.K_w,
+    },
+    TileType.RED_PLAYER: {
+        ControlsType.LEFT: pygame.K_LEFT,
+        ControlsType.RIGHT: pygame.K_RIGHT,
+        ControlsType.JUMP: pygame.K_UP,
+    },
+}
 
 
 class GameScreen(BaseScreen):
@@ -24,18 +54,30 @@ class GameScreen(BaseScreen):
         self.assets = assets
         self.grid: list[list[TileType]] = []
         self.level_name: str = "Level"
+        self.simulation: LevelSimulation | None = None
+        self.recording: InputRecording | None = None
+        self.recording_digest: bytes = b""
+        self.ghost: GhostStore | None = None
+        self.ghost_images: dict[TileType, dict[PoseType, pygame.Surface]] = {}
         self.players: list[Player] = []
         self.has_error: bool = False
         self.screen_width, self.screen_height = pygame.display.get_surface().get_size()
         self.tile_count_width: int = self.screen_width // TILE_SIZE
         self.tile_count_height: int = self.screen_height // TILE_SIZE
         self.level_path: str = ""
+        self.history_path: str = "history.json"
         self.level_complete: bool = False
         self.level_start_time: float = 0.0
-        self.snacks: list[Snack] = []
+        self.snacks: dict[SnackBody, Snack] = {}
         self.movable_books: list[MovableBooks] = []
         self.buttons: list[Button] = []
         self.sprays: list[Spray] = []
+        self.static_layer: pygame.Surface | None = None
+        self.full_redraw: bool = True
+        self.dirty_rects: list[pygame.Rect] = []
+        self.player_rects: list[pygame.Rect] = []
+        self.entities: pygame.sprite.LayeredDirty = pygame.sprite.LayeredDirty()
+        self.drawn_rects: dict[pygame.sprite.DirtySprite, pygame.Rect] = {}
 
     def _get_tyle_type_at(self, x: int, y: int) -> TileType:
         if 0 <= y < self.tile_count_height and 0 <= x < self.tile_count_width:
@@ -44,90 +86,89 @@ class GameScreen(BaseScreen):
 
     def load_level(self, level_path: str) -> None:
         self.level_path = level_path
-        self.movable_books.clear()
+        # a GameScreen is reused for every level, nothing of the previous run may carry over
+        self.level_complete = False
+        self.has_error = False
         try:
-            with open(level_path, "r", encoding="utf-8") as level:
-                data = json.load(level)
+            simulation = LevelSimulation.from_file(
+                level_path, (self.screen_width, self.screen_height)
+            )
+            digest = level_digest(level_path)
         except (OSError, json.JSONDecodeError) as exception:
             print(f"Failed to load level {level_path}: {exception}")
             self.has_error = True
             return
 
-        self.level_name = data.get("name", "Level")
-        grid = data.get("grid", [])
-        self.grid = [[TileType(value) for value in row] for row in grid]
-        self.players.clear()
-        self.snacks.clear()
-        self.buttons.clear()
-        self.sprays.clear()
-
-        for y in range(self.tile_count_height):
-            for x in range(self.tile_count_width):
-                tile_type: TileType = self._get_tyle_type_at(x, y)
-                match tile_type:
-                    case TileType.BLUE_PLAYER:
-                        controls: dict[ControlsType, int] = {
-                            ControlsType.LEFT: pygame.K_a,
-                            ControlsType.RIGHT: pygame.K_d,
-                            ControlsType.JUMP: pygame.K_w,
-                        }
-                        self.players.append(
-                            Player(
-                                self.assets.player_images[tile_type],
-                                (x, y),
-                                controls,
-                                TileType.BLUE_BED
-                            )
-                        )
-
-                    case TileType.RED_PLAYER:
-                        controls = {
-                            ControlsType.LEFT: pygame.K_LEFT,
-                            ControlsType.RIGHT: pygame.K_RIGHT,
-                            ControlsType.JUMP: pygame.K_UP,
-                        }
-                        self.players.append(
-                            Player(
-                                self.assets.player_images[tile_type],
-                                (x, y),
-                                controls,
-                                TileType.RED_BED
-                            )
-                        )
-
-                    case TileType.SNACK:
-                        self.snacks.append(
-                            Snack(
-                                x,
-                                y,
-                                self.assets.entities[tile_type]
-                            )
-                        )
-
-                    case TileType.BOOKS:
-                        self.movable_books.append(
-                            MovableBooks(
-                                x,
-                                y,
-                                self.assets.entities[tile_type]
-                            )
-                        )
-
-                    case TileType.BUTTON:
-                        self.buttons.append(Button(x, y, self.assets))
-
-                    case TileType.SPRAY:
-                        height: int = 1
-                        while (
-                            y - height >= 0
-                            and self._get_tyle_type_at(x, y - height)
-                            in (TileType.EMPTY, TileType.SNACK)
-                        ):
-                            height += 1
-                        self.sprays.append(Spray(x, y, height, self.assets))
+        self.simulation = simulation
+        self.recording = None
+        self.recording_digest = digest
+        self.level_name = simulation.name
+        self.grid = simulation.grid
+        self.has_error = not simulation.is_valid()
+
+        self.players = []
+        for body in simulation.players:
+            player = Player(
+                self.assets.player_poses[body.tile_type], body, PLAYER_CONTROLS[body.tile_type]
+            )
+            player.resolve_bed_anchor(self.grid)
+            self.players.append(player)
+        self.movable_books = [
+            MovableBooks(body, self.assets.entities[TileType.BOOKS]) for body in simulation.books
+        ]
+        self.snacks = {
+            body: Snack(body, self.assets.entities[TileType.SNACK]) for body in simulation.snacks
+        }
+        self.buttons = [Button(body, self.assets) for body in simulation.buttons]
+        self.sprays = [Spray(body, self.assets) for body in simulation.sprays]
+
+        if self.ghost is not None:
+            self.ghost.close()
+        self.ghost = self._load_ghost()
+
+        self.invalidate_static_layer()
+        self._build_entity_group()
+        self.full_redraw = True
+        self.dirty_rects.clear()
+        self.level_start_time = time.perf_counter()
+
+    def _load_ghost(self) -> GhostStore | None:
+        """Opens the ghost of the fastest recorded run, building it on first use."""
+        replay_path = open_history(self.history_path).best_replay(self.level_name)
+        if replay_path is None:
+            return None
+        name = os.path.splitext(os.path.basename(replay_path))[0]
+        ghost_path = os.path.join(GHOSTS_DIR, f"{self.recording_digest.hex()[:16]}_{name}.ghost")
+        try:
+            if not os.path.exists(ghost_path):
+                os.makedirs(GHOSTS_DIR, exist_ok=True)
+                GhostStore.build(ghost_path, InputRecording.load(replay_path), self.level_path)
+            return GhostStore(ghost_path)
+        except (OSError, ValueError, json.JSONDecodeError) as exception:
+            print(f"No ghost for {self.level_name}: {exception}")
+            return None
 
-        self._validate_loaded_level()
-        self.level_start_time = pygame.time.get_ticks() / 1000
+    def _ghost_image(self, tile_type: TileType, pose: PoseType) -> pygame.Surface:
+        poses = self.ghost_images.get(tile_type)
+        if poses is None:
+            poses = {}
+            for pose_type, image in self.assets.player_poses[tile_type].items():
+                poses[pose_type] = image.copy()
+                poses[pose_type].set_alpha(GHOST_ALPHA)
+            self.ghost_images[tile_type] = poses
+        return poses[pose]
+
+    def _ghost_targets(self) -> list[tuple[pygame.Surface, tuple[int, int]]]:
+        if self.ghost is None or self.ghost.player_count != len(self.players):
+            return []
+        targets = []
+        for player, (x, y, pose) in zip(self.players, self.ghost.seek(self.simulation.elapsed)):
+            image = self._ghost_image(player.body.tile_type, pose)
+            if pose == PoseType.SLEEPING and player.bed_anchor is not None:
+                targets.append((image, player.bed_anchor))
+            else:
+                targets.append((image, (x, y)))
+        return targets
 
     def _pick_floor_variant(self, grid: list[list[TileType]], x: int, y: int) -> FloorType:
         grid_width: int = len(grid[0])
@@ -141,9 +182,32 @@ class GameScreen(BaseScreen):
             return FloorType.RIGHT
         return FloorType.FLOOR_SINGLE
 
-    def _validate_loaded_level(self) -> None:
-        if self.tile_count_width != len(self.grid[0]) or self.tile_count_height != len(self.grid):
-            self.has_error = True
+    def _build_entity_group(self) -> None:
+        self.entities.empty()
+        self.entities.add(self.sprays, self.movable_books, self.snacks.values(), self.buttons)
+        self.drawn_rects = {sprite: sprite.rect.copy() for sprite in self.entities}
+
+    def invalidate_static_layer(self) -> None:
+        """Drops the baked floors and beds so the next draw rebuilds them from the grid."""
+        self.static_layer = None
+
+    def _build_static_layer(self) -> pygame.Surface:
+        layer = pygame.Surface(
+            (self.screen_width, self.screen_height), pygame.SRCALPHA
+        ).convert_alpha()
+        for y, row in enumerate(self.grid):
+            for x, tile_type in enumerate(row):
+                match tile_type:
+                    case TileType.FLOOR:
+                        variant = self._pick_floor_variant(self.grid, x, y)
+                        layer.blit(
+                            self.assets.floor_variants[variant],
+                            (x * TILE_SIZE, y * TILE_SIZE)
+                        )
+                    case TileType.RED_BED | TileType.BLUE_BED:
+                        if self._get_tyle_type_at(x + 1, y) == tile_type:
+                            layer.blit(self.assets.beds[tile_type], (x * TILE_SIZE, y * TILE_SIZE))
+        return layer
 
     def handle_event(self, event: pygame.event.Event) -> str | tuple | None:
         if self.level_complete:
@@ -163,19 +227,27 @@ class GameScreen(BaseScreen):
 
     def _on_level_complete(self) -> None:
         if not self.level_complete:
-            elapsed: float = pygame.time.get_ticks() / 1000 - self.level_start_time
-            total_points: int = sum(player.points for player in self.players)
-
-            history_manager = LevelHistoryManager()
-            history_manager.record_attempt(
+            elapsed: float = time.perf_counter() - self.level_start_time
+            total_points: int = self.simulation.total_points()
+
+            replay = None
+            if self.recording is not None:
+                replay = os.path.join(
+                    REPLAYS_DIR, datetime.now().strftime("%Y%m%d_%H%M%S_%f") + ".nhir"
+                )
+            # the replay and the attempt are written by the history writer thread,
+            # which posts the HISTORY invalidation once they are on disk
+            attempt_writer.record_attempt(
+                self.history_path,
                 others.global_values.current_team_name,
                 self.level_name,
                 elapsed,
-                total_points
+                total_points,
+                replay,
+                self.recording
             )
 
-            for player in self.players:
-                player.on_level_complete()
+            self.full_redraw = True
 
         self.level_complete = True
 
@@ -183,24 +255,58 @@ class GameScreen(BaseScreen):
         if self.has_error:
             return
 
-        book_rects = [book.rect for book in self.movable_books]
-
-        for book in self.movable_books:
-            book.update(dt, self.grid, self.players)
+        if not self.simulation.complete:
+            if self.recording is None:
+                self.recording = InputRecording(
+                    self.recording_digest, round(1 / dt), self.simulation.bounds
+                )
+            self.recording.capture(self.simulation)
+        self.simulation.step(dt)
+        for body in self.simulation.collected_snacks:
+            snack = self.snacks.pop(body)
+            snack.kill()
+            self.dirty_rects.append(snack.rect)
 
-        any_pressed: bool = any(button.is_pressed(self.players) for button in self.buttons)
+        for button in self.buttons:
+            button.update()
         for spray in self.sprays:
-            spray.update(any_pressed, self.players)
+            spray.update()
+
+        if self.simulation.complete:
+            self._on_level_complete()
+
+        self.set_interpolation(1.0)
 
+    def set_interpolation(self, alpha: float) -> None:
         for player in self.players:
-            player.update(dt, self.grid, book_rects)
-            for snack in self.snacks[:]:
-                if snack.is_colliding_with(player.rect):
-                    player.points += 1
-                    self.snacks.remove(snack)
+            player.interpolate(alpha)
+        for book in self.movable_books:
+            book.interpolate(alpha)
 
-        if all(player.is_near_bed(self.grid) for player in self.players):
-            self._on_level_complete()
+    def get_dirty_rects(self) -> list[pygame.Rect] | None:
+        if self.has_error:
+            return None
+
+        player_rects = [player.get_draw_rect() for player in self.players]
+        player_rects += [
+            image.get_rect(topleft = position) for image, position in self._ghost_targets()
+        ]
+        rects = self.dirty_rects + self.player_rects + player_rects
+        self.player_rects = player_rects
+        self.dirty_rects = []
+
+        for sprite in self.entities:
+            if sprite.dirty:
+                rects.append(self.drawn_rects[sprite])
+                rects.append(sprite.rect)
+                self.drawn_rects[sprite] = sprite.rect.copy()
+                if sprite.dirty == 1:
+                    sprite.dirty = 0
+
+        if self.full_redraw or self.level_complete or others.global_values.debug_mode:
+            self.full_redraw = False
+            return None
+        return rects
 
     def draw_completion_popup(self, screen: pygame.Surface) -> None:
         popup = pygame.Rect(
@@ -211,44 +317,33 @@ class GameScreen(BaseScreen):
         )
         pygame.draw.rect(screen, pygame.Color("black"), popup)
         pygame.draw.rect(screen, pygame.Color("white"), popup, 4)
-        message = self.font_main.render("Level Complete!", True, pygame.Color("white"))
+        message = render_text(self.font_main, "Level Complete!", pygame.Color("white"))
         screen.blit(message, (popup.centerx - message.get_width() // 2, popup.y + 30))
-        hint = self.font_small.render("Press any key to continue...", True, pygame.Color("gray"))
+        hint = render_text(self.font_small, "Press any key to continue...", pygame.Color("gray"))
         screen.blit(hint, (popup.centerx - hint.get_width() // 2, popup.bottom - 50))
 
     def draw(self, screen: pygame.Surface) -> None:
         if self.has_error:
-            msg = self.font_main.render("Error in level data", True, pygame.Color("red"))
+            msg = render_text(self.font_main, "Error in level data", pygame.Color("red"))
             screen.blit(msg, msg.get_rect(center=screen.get_rect().center))
             return
 
-        for y, row in enumerate(self.grid):
-            for x, tile_type in enumerate(row):
-                match tile_type:
-                    case TileType.FLOOR:
-                        variant = self._pick_floor_variant(self.grid, x, y)
-                        screen.blit(
-                            self.assets.floor_variants[variant],
-                            (x * TILE_SIZE, y * TILE_SIZE)
-                        )
-                    case TileType.RED_BED | TileType.BLUE_BED:
-                        if self._get_tyle_type_at(x + 1, y) == tile_type:
-                            screen.blit(self.assets.beds[tile_type], (x * TILE_SIZE, y * TILE_SIZE))
+        if self.static_layer is None:
+            self.static_layer = self._build_static_layer()
+        screen.blit(self.static_layer, (0, 0))
 
+        for image, position in self._ghost_targets():
+            screen.blit(image, position)
         for player in self.players:
-            player.draw(screen, self.grid)
+            player.draw(screen, self.simulation.collision)
 
-        for spray in self.sprays:
-            spray.draw(screen)
+        # sprites outside the dirty areas are left alone, so repaint whatever the clip uncovers
+        self.entities.repaint_rect(screen.get_clip())
+        self.entities.draw(screen)
 
-        for book in self.movable_books:
-            book.draw(screen)
-
-        for snack in self.snacks:
-            snack.draw(screen)
-
-        for button in self.buttons:
-            button.draw(screen, self.players)
+        if others.global_values.debug_mode:
+            for sprite in self.entities:
+                pygame.draw.rect(screen, pygame.Color("red"), sprite.body.collide_rect, 2)
 
         if self.level_complete:
             self.draw_completion_popup(screen)
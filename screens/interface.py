@@ -1,6 +1,8 @@
 import pygame
 from abc import ABC, abstractmethod
 
+from others import InvalidationType
+
 class BaseScreen(ABC):
     @abstractmethod
     def handle_event(self, event: pygame.event.Event) -> str | tuple | None:
@@ -13,3 +15,19 @@ class BaseScreen(ABC):
     @abstractmethod
     def draw(self, screen: pygame.Surface) -> None:
         pass
+
+    def on_enter(self) -> None:
+        """Called every time the screen becomes the current one."""
+
+    def on_exit(self) -> None:
+        """Called when another screen becomes the current one, and when the game quits."""
+
+    def invalidate(self, reason: InvalidationType) -> None:
+        """Called when data the screen may have cached has changed on disk."""
+
+    def set_interpolation(self, alpha: float) -> None:
+        """Called before drawing with how far the frame is between the last two updates."""
+
+    def get_dirty_rects(self) -> list[pygame.Rect] | None:
+        """Returns the areas changed since the previous frame, or None to redraw everything."""
+        return None
@@ -1,6 +1,9 @@
 import json
+import sqlite3
+
 import pygame
 
+from others import InvalidationType, open_history, render_text
 from screens.interface import BaseScreen
 
 COLUMN_WIDTH = 160
@@ -17,38 +20,40 @@ class Leaderboard(BaseScreen):
         self.sort_key: str = "timestamp"
         self.sort_ascending: bool = False
         self.headers: list[str] = ["team", "level", "time", "points", "timestamp"]
-        self.entries: list[dict] = self._load_entries()
-        self._sort()
-
-    def _load_entries(self) -> list[dict]:
+        self.history = self._open_history()
+        self.entry_count: int = self.history.count() if self.history is not None else 0
+        self.entries_stale: bool = False
+        # the page on screen, fetched again when the scroll, sort or size changes
+        self.visible: list[dict] = []
+        self.visible_key: tuple | None = None
+
+    def on_enter(self) -> None:
+        if self.entries_stale:
+            self.history = self._open_history()
+            self.entry_count = self.history.count() if self.history is not None else 0
+            self.visible_key = None
+            self.entries_stale = False
+
+    def invalidate(self, reason: InvalidationType) -> None:
+        if reason == InvalidationType.HISTORY:
+            self.entries_stale = True
+
+    def _open_history(self):
         try:
-            with open("history.json", "r", encoding="utf-8") as file:
-                data = json.load(file)
-        except (OSError, json.JSONDecodeError):
-            return []
-
-        return [
-            {
-                "team": team,
-                "level": level_name,
-                "time": completion.get("time", 0),
-                "points": completion.get("points", 0),
-                "timestamp": completion.get("timestamp", "")
-            }
-            for team, team_data in data.get("teams", {}).items()
-            for level_name, completions in team_data.get("completed_levels", {}).items()
-            for completion in completions
-        ]
-
-    def _sort(self) -> None:
-        self.entries.sort(
-            key = lambda entry: entry[self.sort_key],
-            reverse = not self.sort_ascending
-        )
+            return open_history()
+        except (OSError, json.JSONDecodeError, sqlite3.Error):
+            return None
+
+    def _visible_entries(self, max_visible: int) -> list[dict]:
+        key = (self.sort_key, self.sort_ascending, self.scroll_offset, max_visible)
+        if key != self.visible_key:
+            self.visible = self.history.page(*key) if self.history is not None else []
+            self.visible_key = key
+        return self.visible
 
     def handle_event(self, event: pygame.event.Event) -> str | None:
         max_visible = (pygame.display.get_surface().get_height() - 60) // LABEL_HEIGHT
-        max_scroll = max(len(self.entries) - max_visible, 0)
+        max_scroll = max(self.entry_count - max_visible, 0)
 
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
@@ -76,14 +81,13 @@ class Leaderboard(BaseScreen):
                         else:
                             self.sort_ascending = True
                         self.sort_key = header
-                        self._sort()
         return None
 
     def update(self, dt: float) -> None:
         pass
 
     def _draw_scroll(self, screen: pygame.Surface, max_visible: int) -> None:
-        total_entries = len(self.entries)
+        total_entries = self.entry_count
         if total_entries > max_visible:
             scrollbar_height = screen.get_height() - START_Y
             scrollbar_width = 8
@@ -111,7 +115,7 @@ class Leaderboard(BaseScreen):
         for entry in entries:
             for index, key in enumerate(self.headers):
                 value = f"{entry[key]:.2f}s" if key == "time" else str(entry[key] or "N/A")
-                label = self.font_small.render(value, True, pygame.Color("lightgray"))
+                label = render_text(self.font_small, value, pygame.Color("lightgray"))
                 screen.blit(label, (START_X + index * COLUMN_WIDTH, y))
             y += LABEL_HEIGHT
 
@@ -122,12 +126,12 @@ class Leaderboard(BaseScreen):
             if header == self.sort_key:
                 arrow = "^" if self.sort_ascending else "v"
                 text += f" {arrow}"
-            label = self.font_main.render(text, True, pygame.Color("white"))
+            label = render_text(self.font_main, text, pygame.Color("white"))
             screen.blit(label, (START_X + index * COLUMN_WIDTH, y))
 
     def draw(self, screen: pygame.Surface) -> None:
         max_visible = (screen.get_height() - START_Y) // LABEL_HEIGHT
-        visible = self.entries[self.scroll_offset:self.scroll_offset + max_visible]
+        visible = self._visible_entries(max_visible)
         screen.fill(pygame.Color("black"))
         self._draw_labels(screen)
         self._draw_entries(screen, visible)
@@ -1,5 +1,8 @@
 import os
 import json
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from typing import Optional, TypedDict, List
 
@@ -14,10 +17,15 @@ from others import (
     Button,
     SprayType,
     Assets,
+    InvalidationType,
+    post_invalidation,
+    render_text,
 )
+from simulation.solver import SolveResult, solve
 
 TILE_SIZE: int = 64
 PALETTE_WIDTH: int = 192
+SOLVER_TIME_LIMIT: float = 10.0
 
 
 class _PaletteItem(TypedDict):
@@ -35,7 +43,6 @@ class LevelBuilder(BaseScreen):
         assets: Assets,
     ) -> None:
         self.screen_width, self.screen_height = pygame.display.get_surface().get_size()
-        pygame.display.set_mode((self.screen_width + PALETTE_WIDTH, self.screen_height))
 
         self.font_main: pygame.font.Font = font_main
         self.font_small: pygame.font.Font = font_small
@@ -55,6 +62,16 @@ class LevelBuilder(BaseScreen):
         self.grid[1][self.tile_count_width - 5] = TileType.RED_BED
         self.grid[1][self.tile_count_width - 4] = TileType.RED_BED
 
+        layer_size = (self.screen_width, self.screen_height)
+        self.item_layer: Surface = pygame.Surface(layer_size, pygame.SRCALPHA).convert_alpha()
+        self.entity_layer: Surface = pygame.Surface(layer_size, pygame.SRCALPHA).convert_alpha()
+        self.grid_layer: Surface = self._build_grid_layer()
+        self.dirty_cells: set[tuple[int, int]] = {
+            (x, y)
+            for y in range(self.tile_count_height)
+            for x in range(self.tile_count_width)
+        }
+
         self.dragging: Optional[tuple[TileType, int, int]] = None
         self.left_down: bool = False
         self.right_down: bool = False
@@ -132,6 +149,32 @@ class LevelBuilder(BaseScreen):
             pygame.Color("white"),
         )
 
+        # saving waits for the solver, which runs in a worker process to keep the editor responsive
+        self.solver_pool: Optional[ProcessPoolExecutor] = None
+        self.pending_check: Optional[Future] = None
+        self.pending_level: Optional[dict] = None
+        self.status: str = ""
+
+    def on_enter(self) -> None:
+        pygame.display.set_mode((self.screen_width + PALETTE_WIDTH, self.screen_height))
+        self.dragging = None
+        self.left_down = False
+        self.right_down = False
+
+    def on_exit(self) -> None:
+        # a check still running doesn't hold up leaving, its level is saved unchecked
+        # and the worker exits once the check is done
+        if self.pending_check is not None and self.pending_check.done():
+            self._finish_save()
+        elif self.pending_check is not None:
+            self._write_level(self.pending_level)
+            self.pending_check = None
+            self.pending_level = None
+            self.status = "Saved unchecked"
+        if self.solver_pool is not None:
+            self.solver_pool.shutdown(wait = False, cancel_futures = True)
+            self.solver_pool = None
+
     def _pick_floor_variant(self, x: int, y: int) -> FloorType:
         left = x > 0 and self._get_tyle_type_at(x - 1, y) == TileType.FLOOR
         right = (
@@ -170,17 +213,57 @@ class LevelBuilder(BaseScreen):
             return self.grid[y][x]
         return TileType.INVALID
 
+    def _set_tile(self, x: int, y: int, tile_type: TileType) -> None:
+        if self.grid[y][x] == tile_type:
+            return
+        self.grid[y][x] = tile_type
+        # floor variants and bed halves depend on the horizontal neighbours
+        for cell_x in (x - 1, x, x + 1):
+            if 0 <= cell_x < self.tile_count_width:
+                self.dirty_cells.add((cell_x, y))
+
     def _save_level(self) -> None:
-        os.makedirs("levels", exist_ok=True)
-        filename = datetime.now().strftime("%Y%m%d_%H%M%S") + "_level.json"
-        path = os.path.join("levels", filename)
-        data = {
+        if self.pending_check is not None:
+            return
+        if self.solver_pool is None:
+            # spawned, a forked worker would inherit the history writer thread and its locks
+            self.solver_pool = ProcessPoolExecutor(
+                max_workers = 1, mp_context = multiprocessing.get_context("spawn")
+            )
+        self.pending_level = {
             "name": self.level_name_box.label,
             "grid": [[cell.value for cell in row] for row in self.grid],
         }
+        self.pending_check = self.solver_pool.submit(
+            solve, [row[:] for row in self.grid], None, SOLVER_TIME_LIMIT
+        )
+        self.status = "Checking level..."
+
+    def _finish_save(self) -> None:
+        try:
+            result = self.pending_check.result()
+        except BrokenProcessPool as exception:
+            print(f"Level check failed: {exception}")
+            self.solver_pool = None
+            result = SolveResult.TIMEOUT
+        data = self.pending_level
+        self.pending_check = None
+        self.pending_level = None
+
+        if result == SolveResult.UNSOLVABLE:
+            self.status = "Beds can't be reached"
+            return
+        self._write_level(data)
+        self.status = "Saved" if result == SolveResult.SOLVABLE else "Saved, check timed out"
+
+    def _write_level(self, data: dict) -> None:
+        os.makedirs("levels", exist_ok=True)
+        filename = datetime.now().strftime("%Y%m%d_%H%M%S") + "_level.json"
+        path = os.path.join("levels", filename)
         with open(path, "w", encoding="utf-8") as file:
             json.dump(data, file, indent=2)
         print(f"Level saved: {path}")
+        post_invalidation(InvalidationType.LEVELS)
 
     def _handle_click_event(self, event: pygame.event.Event) -> None:
         mouse_x, mouse_y = event.pos
@@ -205,9 +288,9 @@ class LevelBuilder(BaseScreen):
             grid_x, grid_y = mouse_x // TILE_SIZE, mouse_y // TILE_SIZE
             if self._entity_at(grid_x, grid_y) is None:
                 if event.button == 1:
-                    self.grid[grid_y][grid_x] = self.selected_item_type
+                    self._set_tile(grid_x, grid_y, self.selected_item_type)
                 elif event.button == 3:
-                    self.grid[grid_y][grid_x] = TileType.EMPTY
+                    self._set_tile(grid_x, grid_y, TileType.EMPTY)
 
         self.save_button.handle_event(event)
 
@@ -230,9 +313,9 @@ class LevelBuilder(BaseScreen):
         if mouse_x < self.screen_width and mouse_y < self.screen_height:
             grid_x, grid_y = mouse_x // TILE_SIZE, mouse_y // TILE_SIZE
             if self.left_down and self._entity_at(grid_x, grid_y) is None:
-                self.grid[grid_y][grid_x] = self.selected_item_type
+                self._set_tile(grid_x, grid_y, self.selected_item_type)
             elif self.right_down and self._entity_at(grid_x, grid_y) is None:
-                self.grid[grid_y][grid_x] = TileType.EMPTY
+                self._set_tile(grid_x, grid_y, TileType.EMPTY)
 
         if self.dragging and mouse_x < self.screen_width and mouse_y < self.screen_height:
             grid_x, grid_y = mouse_x // TILE_SIZE, mouse_y // TILE_SIZE
@@ -246,8 +329,8 @@ class LevelBuilder(BaseScreen):
                     not self._is_bed_tile(grid_x, grid_y)
                     and self._get_tyle_type_at(grid_x, grid_y) == TileType.EMPTY
                 ):
-                    self.grid[old_y][old_x] = TileType.EMPTY
-                    self.grid[grid_y][grid_x] = kind
+                    self._set_tile(old_x, old_y, TileType.EMPTY)
+                    self._set_tile(grid_x, grid_y, kind)
                     self.dragging = (kind, grid_x, grid_y)
 
             elif kind in (TileType.BLUE_BED, TileType.RED_BED):
@@ -258,10 +341,10 @@ class LevelBuilder(BaseScreen):
                     self._get_tyle_type_at(grid_x, grid_y) == TileType.EMPTY
                     and self._get_tyle_type_at(grid_x + 1, grid_y) == TileType.EMPTY
                 ):
-                    self.grid[old_y][old_x] = TileType.EMPTY
-                    self.grid[old_y][old_x + 1] = TileType.EMPTY
-                    self.grid[grid_y][grid_x] = kind
-                    self.grid[grid_y][grid_x + 1] = kind
+                    self._set_tile(old_x, old_y, TileType.EMPTY)
+                    self._set_tile(old_x + 1, old_y, TileType.EMPTY)
+                    self._set_tile(grid_x, grid_y, kind)
+                    self._set_tile(grid_x + 1, grid_y, kind)
                     self.dragging = (kind, grid_x, grid_y)
 
     def handle_event(
@@ -284,17 +367,24 @@ class LevelBuilder(BaseScreen):
 
     def update(self, dt: float) -> None:
         self.level_name_box.update(dt)
+        if self.pending_check is not None and self.pending_check.done():
+            self._finish_save()
 
-    def _draw_grid(self, screen: Surface) -> None:
+    def _build_grid_layer(self) -> Surface:
+        layer = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
         grid_color = pygame.Color("dimgray")
         for x in range(self.tile_count_width + 1):
             pygame.draw.line(
-                screen, grid_color, (x * TILE_SIZE, 0), (x * TILE_SIZE, self.screen_height)
+                layer, grid_color, (x * TILE_SIZE, 0), (x * TILE_SIZE, self.screen_height)
             )
         for y in range(self.tile_count_height + 1):
             pygame.draw.line(
-                screen, grid_color, (0, y * TILE_SIZE), (self.screen_width, y * TILE_SIZE)
+                layer, grid_color, (0, y * TILE_SIZE), (self.screen_width, y * TILE_SIZE)
             )
+        return layer.convert_alpha()
+
+    def _draw_grid(self, screen: Surface) -> None:
+        screen.blit(self.grid_layer, (0, 0))
 
         if self.hover_cell:
             gx, gy = self.hover_cell
@@ -305,52 +395,52 @@ class LevelBuilder(BaseScreen):
                 2,
             )
 
-    def _draw_items(self, screen: Surface) -> None:
-        for y in range(self.tile_count_height):
-            for x in range(self.tile_count_width):
-                tile_type = self._get_tyle_type_at(x, y)
-                item_position = (x * TILE_SIZE, y * TILE_SIZE)
-                if tile_type == TileType.FLOOR:
-                    variant = self._pick_floor_variant(x, y)
-                    screen.blit(self.assets.floor_variants[variant], item_position)
-                elif tile_type == TileType.SNACK:
-                    screen.blit(self.assets.entities[TileType.SNACK], item_position)
-                elif tile_type == TileType.BOOKS:
-                    screen.blit(self.assets.entities[TileType.BOOKS], item_position)
-                elif tile_type == TileType.SPRAY:
-                    screen.blit(self.assets.sprays[SprayType.OFF], item_position)
-                elif tile_type == TileType.BUTTON:
-                    screen.blit(self.assets.entities[TileType.BUTTON], item_position)
-
-    def _draw_players(self, screen: Surface) -> None:
-        for y in range(self.tile_count_height):
-            for x in range(self.tile_count_width):
-                tile_type = self._get_tyle_type_at(x, y)
-                if tile_type == TileType.RED_PLAYER:
-                    screen.blit(
-                        self.assets.player_images[TileType.RED_PLAYER],
-                        (x * TILE_SIZE, y * TILE_SIZE),
-                    )
-                elif tile_type == TileType.BLUE_PLAYER:
-                    screen.blit(
-                        self.assets.player_images[TileType.BLUE_PLAYER],
-                        (x * TILE_SIZE, y * TILE_SIZE),
-                    )
-
-    def _draw_beds(self, screen: Surface) -> None:
-        for y in range(self.tile_count_height):
-            for x in range(self.tile_count_width):
-                tile_type = self._get_tyle_type_at(x, y)
-                if (
-                    tile_type == TileType.RED_BED
-                    and self._get_tyle_type_at(x + 1, y) == TileType.RED_BED
-                ):
-                    screen.blit(self.assets.beds[TileType.RED_BED], (x * TILE_SIZE, y * TILE_SIZE))
-                elif (
-                    tile_type == TileType.BLUE_BED
-                    and self._get_tyle_type_at(x + 1, y) == TileType.BLUE_BED
-                ):
-                    screen.blit(self.assets.beds[TileType.BLUE_BED], (x * TILE_SIZE, y * TILE_SIZE))
+    def _draw_item(self, x: int, y: int) -> None:
+        tile_type = self._get_tyle_type_at(x, y)
+        item_position = (x * TILE_SIZE, y * TILE_SIZE)
+        if tile_type == TileType.FLOOR:
+            variant = self._pick_floor_variant(x, y)
+            self.item_layer.blit(self.assets.floor_variants[variant], item_position)
+        elif tile_type == TileType.SNACK:
+            self.item_layer.blit(self.assets.entities[TileType.SNACK], item_position)
+        elif tile_type == TileType.BOOKS:
+            self.item_layer.blit(self.assets.entities[TileType.BOOKS], item_position)
+        elif tile_type == TileType.SPRAY:
+            self.item_layer.blit(self.assets.sprays[SprayType.OFF], item_position)
+        elif tile_type == TileType.BUTTON:
+            self.item_layer.blit(self.assets.entities[TileType.BUTTON], item_position)
+
+    def _draw_player(self, x: int, y: int) -> None:
+        tile_type = self._get_tyle_type_at(x, y)
+        if tile_type in (TileType.RED_PLAYER, TileType.BLUE_PLAYER):
+            self.entity_layer.blit(
+                self.assets.player_images[tile_type],
+                (x * TILE_SIZE, y * TILE_SIZE),
+            )
+
+    def _draw_beds(self, x: int, y: int) -> None:
+        # beds are two tiles wide, so a cell can also hold the right half of the bed to its left
+        for bed_x in (x - 1, x):
+            tile_type = self._get_tyle_type_at(bed_x, y)
+            if (
+                tile_type in (TileType.RED_BED, TileType.BLUE_BED)
+                and self._get_tyle_type_at(bed_x + 1, y) == tile_type
+            ):
+                self.entity_layer.blit(
+                    self.assets.beds[tile_type], (bed_x * TILE_SIZE, y * TILE_SIZE)
+                )
+
+    def _redraw_dirty_cells(self) -> None:
+        for x, y in self.dirty_cells:
+            cell_rect = pygame.Rect(x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+            self.item_layer.fill((0, 0, 0, 0), cell_rect)
+            self.entity_layer.fill((0, 0, 0, 0), cell_rect)
+            self._draw_item(x, y)
+            self.entity_layer.set_clip(cell_rect)
+            self._draw_player(x, y)
+            self._draw_beds(x, y)
+            self.entity_layer.set_clip(None)
+        self.dirty_cells.clear()
 
     def _draw_palette(self, screen: Surface) -> None:
         pygame.draw.rect(screen, pygame.Color("black"), self.palette_rect)
@@ -360,7 +450,7 @@ class LevelBuilder(BaseScreen):
             if image:
                 screen.blit(image, rect.topleft)
 
-            label = self.font_small.render(item["name"], True, pygame.Color("white"))
+            label = render_text(self.font_small, item["name"], pygame.Color("white"))
             screen.blit(label, (rect.x, rect.bottom + 4))
 
             if item["type"] == self.selected_item_type:
@@ -370,10 +460,14 @@ class LevelBuilder(BaseScreen):
 
         self.level_name_box.draw(screen)
         self.save_button.draw(screen)
+        if self.status:
+            status = render_text(self.font_small, self.status, pygame.Color("white"))
+            status_y = self.level_name_box.rect.y - status.get_height() - 8
+            screen.blit(status, (self.level_name_box.rect.x, status_y))
 
     def draw(self, screen: Surface) -> None:
-        self._draw_items(screen)
+        self._redraw_dirty_cells()
+        screen.blit(self.item_layer, (0, 0))
         self._draw_grid(screen)
-        self._draw_players(screen)
-        self._draw_beds(screen)
+        screen.blit(self.entity_layer, (0, 0))
         self._draw_palette(screen)
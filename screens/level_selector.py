@@ -1,10 +1,18 @@
 import os
 import json
+import sqlite3
 from typing import Callable, cast
 
 import pygame
 
-from others import Button, Assets, global_values
+from others import (
+    Button,
+    Assets,
+    InvalidationType,
+    global_values,
+    open_history,
+    render_text,
+)
 from screens.interface import BaseScreen
 
 LEVEL_BUTTON_HEIGHT = 56
@@ -24,17 +32,43 @@ class LevelSelect(BaseScreen):
         self.font_small: pygame.font.Font = font_small
         self.assets: Assets = assets
         self.level_buttons: list[Button] = []
+        self.level_names: list[str] = []
         self.next_screen: str | tuple | None = None
-        self._scan_levels()
+        self.levels_mtime: int = -1
+        self.levels_stale: bool = True
+        self.passed_stale: bool = True
+        self.team_name: str = global_values.current_team_name
+
+    def on_enter(self) -> None:
+        self.next_screen = None
+        os.makedirs("levels", exist_ok=True)
+        if self.levels_stale or os.stat("levels").st_mtime_ns != self.levels_mtime:
+            self._scan_levels()
+        elif self.passed_stale or self.team_name != global_values.current_team_name:
+            self._refresh_passed_levels()
+
+    def invalidate(self, reason: InvalidationType) -> None:
+        if reason == InvalidationType.LEVELS:
+            self.levels_stale = True
+        elif reason == InvalidationType.HISTORY:
+            self.passed_stale = True
+
+    def _refresh_passed_levels(self) -> None:
+        self.team_name = global_values.current_team_name
+        passed_levels = self._load_passed_levels()
+        for button, name in zip(self.level_buttons, self.level_names):
+            button.show_check = name in passed_levels
+        self.passed_stale = False
 
     def _scan_levels(self) -> None:
         self.level_buttons.clear()
+        self.level_names.clear()
         os.makedirs("levels", exist_ok=True)
+        self.levels_mtime = os.stat("levels").st_mtime_ns
         file_paths = sorted(
             [file for file in os.listdir("levels") if file.endswith(".json")]
         )
         y = LEVEL_LIST_START_POS
-        passed_levels = self._load_passed_levels()
 
         for file_path in file_paths:
             full_path = os.path.join("levels", file_path)
@@ -53,32 +87,27 @@ class LevelSelect(BaseScreen):
                 LEVEL_BUTTON_HEIGHT,
             )
 
-            was_passed = name in passed_levels
             button = Button(
                 pos = (rect.x, rect.y),
                 size = (rect.width, rect.height),
                 label = name,
                 on_click = cast(Callable[[], None], lambda path = full_path: self._set_next(path)),
                 font = self.font_small,
-                show_check = was_passed,
                 check_image = self.assets.passed_level_image
             )
             self.level_buttons.append(button)
+            self.level_names.append(name)
             y += LEVEL_BUTTON_HEIGHT + LEVEL_BUTTON_VERTICAL_PADDING
 
+        self.levels_stale = False
+        self._refresh_passed_levels()
+
     def _load_passed_levels(self) -> set[str]:
         team_name = global_values.current_team_name
         try:
-            with open("history.json", "r", encoding="utf-8") as file:
-                data = json.load(file)
-                return set(
-                    data.get("teams", {})
-                    .get(team_name, {})
-                    .get("completed_levels", {})
-                    .keys()
-                )
-        except (OSError, json.JSONDecodeError) as exception:
-            print(f"Could not read history.json: {exception}")
+            return open_history().completed_levels(team_name)
+        except (OSError, json.JSONDecodeError, sqlite3.Error) as exception:
+            print(f"Could not read the history: {exception}")
             return set()
 
     def _set_next(self, level_path: str) -> None:
@@ -100,7 +129,7 @@ class LevelSelect(BaseScreen):
 
     def draw(self, screen: pygame.Surface) -> None:
         screen_width = screen.get_width()
-        title = self.font_main.render("Select Level", True, pygame.Color("royalblue3"))
+        title = render_text(self.font_main, "Select Level", pygame.Color("royalblue3"))
         screen.blit(
             title,
             (
@@ -0,0 +1,27 @@
+from typing import Callable
+
+from others import InvalidationType
+from screens.interface import BaseScreen
+
+
+class ScreenPool:
+    """Builds each screen once and hands out the same instance on every navigation."""
+
+    def __init__(self, factories: dict[str, Callable[[], BaseScreen]]) -> None:
+        self.factories: dict[str, Callable[[], BaseScreen]] = factories
+        self.screens: dict[str, BaseScreen] = {}
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.factories
+
+    def get(self, name: str) -> BaseScreen:
+        screen = self.screens.get(name)
+        if screen is None:
+            screen = self.factories[name]()
+            self.screens[name] = screen
+        screen.on_enter()
+        return screen
+
+    def invalidate(self, reason: InvalidationType) -> None:
+        for screen in self.screens.values():
+            screen.invalidate(reason)
@@ -0,0 +1,27 @@
+from .facing import Facing
+from .player_body import PlayerBody
+from .book_body import BookBody
+from .snack_body import SnackBody
+from .button_body import ButtonBody
+from .spray_body import SprayBody
+from .collision_map import CollisionMap
+from .spatial_grid import SpatialGrid
+from .level_simulation import LevelSimulation
+from .input_recording import InputRecording, level_digest, replay
+from .ghost_store import GhostStore
+
+__all__ = [
+    "Facing",
+    "PlayerBody",
+    "BookBody",
+    "SnackBody",
+    "ButtonBody",
+    "SprayBody",
+    "CollisionMap",
+    "SpatialGrid",
+    "LevelSimulation",
+    "InputRecording",
+    "level_digest",
+    "replay",
+    "GhostStore"
+]
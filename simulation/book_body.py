@@ -0,0 +1,70 @@
+import pygame
+
+from simulation.facing import Facing
+
+TILE_SIZE = 64
+
+class BookBody:
+    __slots__ = ("rect", "x", "y", "previous_pos", "velocity", "on_ground", "bounds")
+
+    gravity = 900
+    push_offset = 16
+
+    def __init__(self, x, y, bounds):
+        self.rect = pygame.Rect(x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+        self.x = float(self.rect.x)
+        self.y = float(self.rect.y)
+        self.previous_pos = (self.x, self.y)
+        self.velocity = 0
+        self.on_ground = False
+        self.bounds = bounds
+
+    @property
+    def collide_rect(self):
+        # books collide with all of their tile
+        return self.rect
+
+    def update(self, dt, collision, players):
+        self.previous_pos = (self.x, self.y)
+        rect = self.rect
+
+        if not self.on_ground:
+            self.velocity += self.gravity * dt
+        self.y += self.velocity * dt
+        rect.y = round(self.y)
+        self.on_ground = False
+        for floor_top in collision.floor_tops_at(rect):
+            if rect.colliderect(floor_top):
+                rect.bottom = floor_top.top
+                self.y = float(rect.y)
+                self.velocity = 0
+                self.on_ground = True
+
+        push_offset = self.push_offset
+        for player in players:
+            if player.rect.colliderect(rect):
+                if (
+                    player.facing == Facing.RIGHT
+                    and player.rect.right <= rect.left + push_offset
+                    ):
+                    self.x += player.speed * dt
+                elif (
+                    player.facing == Facing.LEFT
+                    and player.rect.left >= rect.right - push_offset
+                    ):
+                    self.x -= player.speed * dt
+        rect.x = round(self.x)
+
+        world_width, world_height = self.bounds
+        if rect.bottom > world_height:
+            rect.bottom = world_height
+            self.y = float(rect.y)
+            self.velocity = 0
+            self.on_ground = True
+
+        if rect.left < 0:
+            rect.left = 0
+            self.x = float(rect.x)
+        if rect.right > world_width:
+            rect.right = world_width
+            self.x = float(rect.x)
@@ -0,0 +1,152 @@
+import numpy
+import pygame
+
+from simulation.book_body import BookBody
+from simulation.collision_map import CollisionMap, FLOOR_THICKNESS
+from simulation.facing import Facing
+
+TILE_SIZE = 64
+
+
+class BookView:
+    """One book of a BookPhysicsEngine, readable like a BookBody."""
+
+    __slots__ = ("engine", "index", "rect")
+
+    def __init__(self, engine: "BookPhysicsEngine", index: int, rect: pygame.Rect) -> None:
+        self.engine = engine
+        self.index = index
+        self.rect = rect
+
+    @property
+    def x(self) -> float:
+        return float(self.engine.x[self.index])
+
+    @property
+    def y(self) -> float:
+        return float(self.engine.y[self.index])
+
+    @property
+    def previous_pos(self) -> tuple[float, float]:
+        engine = self.engine
+        return float(engine.previous_x[self.index]), float(engine.previous_y[self.index])
+
+    @property
+    def velocity(self) -> float:
+        return float(self.engine.velocity[self.index])
+
+    @property
+    def on_ground(self) -> bool:
+        return bool(self.engine.on_ground[self.index])
+
+    @property
+    def collide_rect(self) -> pygame.Rect:
+        return self.rect
+
+
+class BookPhysicsEngine:
+    """Steps every book of a level at once on NumPy arrays.
+
+    Follows BookBody.update exactly: gravity, the floor contacts against the
+    level's floor mask, pushes from players and the world bounds are applied
+    to all books in batched operations. Only the Rects of books that moved
+    are written back, since players and the spatial grid read those.
+    """
+
+    def __init__(
+            self,
+            books: list[BookBody],
+            collision: CollisionMap,
+            bounds: tuple[int, int]
+        ) -> None:
+        self.rects: list[pygame.Rect] = [book.rect for book in books]
+        self.x = numpy.array([book.x for book in books], dtype = numpy.float64)
+        self.y = numpy.array([book.y for book in books], dtype = numpy.float64)
+        self.previous_x = self.x.copy()
+        self.previous_y = self.y.copy()
+        self.velocity = numpy.array([book.velocity for book in books], dtype = numpy.float64)
+        self.on_ground = numpy.array([book.on_ground for book in books], dtype = bool)
+        self.rect_x = numpy.array([rect.x for rect in self.rects], dtype = numpy.int64)
+        self.rect_y = numpy.array([rect.y for rect in self.rects], dtype = numpy.int64)
+        self.gravity = BookBody.gravity
+        self.world_width, self.world_height = bounds
+
+        # padded by one tile on every side so out of grid lookups read as empty
+        self.floor_mask = numpy.zeros((collision.height + 2, collision.width + 2), dtype = bool)
+        self.floor_mask[1:-1, 1:-1] = [
+            [floor_top is not None for floor_top in row] for row in collision.floor_tops
+        ]
+        self.moved: list[int] = []
+        self.books = [BookView(self, index, rect) for index, rect in enumerate(self.rects)]
+
+    def _floor_in_row(self, row, left, right):
+        rows, columns = self.floor_mask.shape
+        row = numpy.clip(row + 1, 0, rows - 1)
+        return (
+            self.floor_mask[row, numpy.clip(left + 1, 0, columns - 1)]
+            | ((right > left) & self.floor_mask[row, numpy.clip(right + 1, 0, columns - 1)])
+        )
+
+    def step(self, dt, players) -> None:
+        self.previous_x[:] = self.x
+        self.previous_y[:] = self.y
+        x, y, velocity, on_ground = self.x, self.y, self.velocity, self.on_ground
+
+        velocity += numpy.where(on_ground, 0.0, self.gravity * dt)
+        y += velocity * dt
+        rect_x = self.rect_x
+        rect_y = numpy.round(y).astype(numpy.int64)
+
+        left = rect_x // TILE_SIZE
+        right = (rect_x + TILE_SIZE - 1) // TILE_SIZE
+        top = rect_y // TILE_SIZE
+        bottom = (rect_y + TILE_SIZE - 1) // TILE_SIZE
+        # a floor top in the first covered row only overlaps the upper FLOOR_THICKNESS pixels
+        hit_top = (
+            (rect_y - top * TILE_SIZE < FLOOR_THICKNESS) & self._floor_in_row(top, left, right)
+        )
+        hit_bottom = ~hit_top & (bottom > top) & self._floor_in_row(bottom, left, right)
+        landed = hit_top | hit_bottom
+        rect_y = numpy.where(hit_top, (top - 1) * TILE_SIZE, rect_y)
+        rect_y = numpy.where(hit_bottom, (bottom - 1) * TILE_SIZE, rect_y)
+        y[landed] = rect_y[landed]
+        velocity[landed] = 0
+        on_ground[:] = landed
+
+        push_offset = BookBody.push_offset
+        for player in players:
+            player_rect = player.rect
+            touching = (
+                (rect_x < player_rect.right) & (rect_x + TILE_SIZE > player_rect.left)
+                & (rect_y < player_rect.bottom) & (rect_y + TILE_SIZE > player_rect.top)
+            )
+            push = player.speed * dt
+            if player.facing == Facing.RIGHT:
+                numpy.add(
+                    x, push, out = x,
+                    where = touching & (player_rect.right <= rect_x + push_offset)
+                )
+            elif player.facing == Facing.LEFT:
+                numpy.subtract(
+                    x, push, out = x,
+                    where = touching & (player_rect.left >= rect_x + TILE_SIZE - push_offset)
+                )
+        rect_x = numpy.round(x).astype(numpy.int64)
+
+        below = rect_y + TILE_SIZE > self.world_height
+        if below.any():
+            rect_y[below] = self.world_height - TILE_SIZE
+            y[below] = rect_y[below]
+            velocity[below] = 0
+            on_ground[below] = True
+
+        outside = (rect_x < 0) | (rect_x + TILE_SIZE > self.world_width)
+        if outside.any():
+            rect_x = numpy.clip(rect_x, 0, self.world_width - TILE_SIZE)
+            x[outside] = rect_x[outside]
+
+        self.moved = numpy.flatnonzero((rect_x != self.rect_x) | (rect_y != self.rect_y)).tolist()
+        for index in self.moved:
+            self.rects[index].topleft = (int(rect_x[index]), int(rect_y[index]))
+        self.rect_x = rect_x
+        self.rect_y = rect_y
@@ -0,0 +1,46 @@
+import pygame
+
+TILE_SIZE = 64
+
+class ButtonBody:
+    """A floor button that tells its targets when it is pressed and released.
+
+    The level reports contacts as players step on and off, and targets get
+    trigger_pressed or trigger_released only when pressed changes.
+    """
+
+    __slots__ = ("x", "y", "pressed", "contacts", "targets", "rect", "collide_rect")
+
+    collide_offset = 32
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.pressed = False
+        self.contacts = 0
+        self.targets = []
+        self.rect = pygame.Rect(x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+        collide_offset = self.collide_offset
+        self.collide_rect = pygame.Rect(
+            x * TILE_SIZE + collide_offset // 2,
+            y * TILE_SIZE + collide_offset,
+            TILE_SIZE - collide_offset,
+            TILE_SIZE - collide_offset
+        )
+
+    def is_colliding_with(self, player_rect):
+        return self.collide_rect.colliderect(player_rect)
+
+    def add_contact(self):
+        self.contacts += 1
+        if self.contacts == 1:
+            self.pressed = True
+            for target in self.targets:
+                target.trigger_pressed()
+
+    def remove_contact(self):
+        self.contacts -= 1
+        if self.contacts == 0:
+            self.pressed = False
+            for target in self.targets:
+                target.trigger_released()
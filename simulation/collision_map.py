@@ -0,0 +1,74 @@
+import pygame
+
+from others import TileType
+
+TILE_SIZE = 64
+FLOOR_THICKNESS = 15
+
+
+class CollisionMap:
+    """Static collision geometry of a level grid, built once when the level is loaded.
+
+    Bodies look up the tile area their rect covers. The floor tops and tile
+    types of every area are collected the first time it is asked for and
+    reused afterwards, so the physics loop does no per-tile work.
+    """
+
+    def __init__(self, grid: list[list[TileType]]) -> None:
+        self.grid = grid
+        self.height: int = len(grid)
+        self.width: int = min((len(row) for row in grid), default = 0)
+        self.floor_tops: list[list[pygame.Rect | None]] = [
+            [
+                pygame.Rect(x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, FLOOR_THICKNESS)
+                if grid[y][x] == TileType.FLOOR else None
+                for x in range(self.width)
+            ]
+            for y in range(self.height)
+        ]
+        self._areas: dict[
+            tuple[int, int, int, int],
+            tuple[tuple[pygame.Rect, ...], frozenset[TileType]]
+        ] = {}
+
+    def _area(self, rect: pygame.Rect) -> tuple[tuple[pygame.Rect, ...], frozenset[TileType]]:
+        key = (
+            rect.left // TILE_SIZE,
+            rect.top // TILE_SIZE,
+            (rect.right - 1) // TILE_SIZE,
+            (rect.bottom - 1) // TILE_SIZE
+        )
+        area = self._areas.get(key)
+        if area is None:
+            tiles = self._tiles_in(*key)
+            area = (
+                tuple(
+                    self.floor_tops[y][x] for x, y in tiles if self.floor_tops[y][x] is not None
+                ),
+                frozenset(self.grid[y][x] for x, y in tiles)
+            )
+            self._areas[key] = area
+        return area
+
+    def _tiles_in(self, left: int, top: int, right: int, bottom: int) -> list[tuple[int, int]]:
+        return [
+            (x, y)
+            for y in range(max(top, 0), min(bottom, self.height - 1) + 1)
+            for x in range(max(left, 0), min(right, self.width - 1) + 1)
+        ]
+
+    def overlapping_tiles(self, rect: pygame.Rect) -> list[tuple[int, int]]:
+        """Returns the (x, y) of every grid tile the rect covers, row by row."""
+        return self._tiles_in(
+            rect.left // TILE_SIZE,
+            rect.top // TILE_SIZE,
+            (rect.right - 1) // TILE_SIZE,
+            (rect.bottom - 1) // TILE_SIZE
+        )
+
+    def floor_tops_at(self, rect: pygame.Rect) -> tuple[pygame.Rect, ...]:
+        """Returns the floor-top rects of the tiles the rect covers, row by row."""
+        return self._area(rect)[0]
+
+    def touches_tile(self, rect: pygame.Rect, tile_type: TileType) -> bool:
+        return tile_type in self._area(rect)[1]
@@ -0,0 +1,5 @@
+from enum import IntEnum
+
+class Facing(IntEnum):
+    LEFT = 0
+    RIGHT = 1
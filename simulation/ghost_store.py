@@ -0,0 +1,90 @@
+import mmap
+import os
+import struct
+
+from others import PoseType
+from simulation.facing import Facing
+from simulation.input_recording import InputRecording, load_recorded_level, replay_steps
+
+# magic, format version, ticks per second, players per frame, frame count
+HEADER = struct.Struct("<4sBHBI")
+# x, y and PoseType of one player in one tick
+PLAYER_FRAME = struct.Struct("<hhB")
+MAGIC = b"NHGH"
+VERSION = 1
+
+
+def _pose(player) -> PoseType:
+    if player.is_sleeping:
+        return PoseType.SLEEPING
+    if player.facing == Facing.RIGHT:
+        return PoseType.RIGHT
+    return PoseType.LEFT
+
+
+class GhostStore:
+    """Player positions of one recorded run, read from a memory-mapped file.
+
+    Every tick is a fixed-size frame of absolute positions, so any frame is
+    found from its tick alone and only the pages that are read get loaded.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Raises OSError or ValueError when the file is not a readable ghost."""
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ)
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not a ghost")
+        magic, version, self.tick_rate, self.player_count, self.frame_count = (
+            HEADER.unpack_from(self._map)
+        )
+        self.frame_size = PLAYER_FRAME.size * self.player_count
+        if (
+            magic != MAGIC
+            or version != VERSION
+            or self.frame_count == 0
+            or len(self._map) != HEADER.size + self.frame_size * self.frame_count
+        ):
+            self.close()
+            raise ValueError(f"{path} is not a ghost")
+
+    @staticmethod
+    def build(path: str, recording: InputRecording, level_path: str) -> None:
+        """Replays recording on the level and writes a frame for every tick to path.
+
+        Raises the errors of load_recorded_level, and OSError when path can't be written.
+        """
+        simulation = load_recorded_level(recording, level_path)
+        players = simulation.players
+        temporary_path = path + ".tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(
+                HEADER.pack(MAGIC, VERSION, recording.tick_rate, len(players), recording.tick_count)
+            )
+            for _ in replay_steps(recording, simulation):
+                file.write(b"".join(
+                    PLAYER_FRAME.pack(player.rect.x, player.rect.y, _pose(player))
+                    for player in players
+                ))
+        os.replace(temporary_path, path)
+
+    def frame(self, tick: int) -> list[tuple[int, int, PoseType]]:
+        """Returns the (x, y, pose) of every player after tick, held at the last frame."""
+        tick = min(max(tick, 0), self.frame_count - 1)
+        offset = HEADER.size + tick * self.frame_size
+        return [
+            (x, y, PoseType(pose))
+            for x, y, pose in PLAYER_FRAME.iter_unpack(self._map[offset:offset + self.frame_size])
+        ]
+
+    def seek(self, seconds: float) -> list[tuple[int, int, PoseType]]:
+        """Returns the frame of the tick ending nearest to seconds into the run.
+
+        Frames are looked up by time, so the ghost keeps its speed when the
+        game runs at another tick rate than the one it was recorded at.
+        """
+        return self.frame(round(seconds * self.tick_rate) - 1)
+
+    def close(self) -> None:
+        self._map.close()
@@ -0,0 +1,149 @@
+"""Per-tick input recordings of level runs and a headless replayer for them.
+
+Usage: python -m simulation.input_recording RECORDING LEVEL
+"""
+
+import argparse
+import hashlib
+import os
+import struct
+import time
+
+from simulation.level_simulation import LevelSimulation
+from simulation.player_body import INPUT_BITS
+
+# magic, format version, ticks per second, world width and height, level digest, tick count
+HEADER = struct.Struct("<4sBHHH32sI")
+# input bits of every player for a run of ticks, and the length of the run
+RUN = struct.Struct("<HH")
+MAGIC = b"NHIR"
+VERSION = 1
+MAX_RUN = 0xFFFF
+
+
+def level_digest(level_path: str) -> bytes:
+    """Raises OSError when the level can't be read."""
+    with open(level_path, "rb") as level:
+        return hashlib.sha256(level.read()).digest()
+
+
+class InputRecording:
+    """The input state of every player for every tick of one run of a level.
+
+    Ticks are stored run-length encoded, since inputs change only every few
+    dozen ticks, as INPUT_BITS bits per player packed in a 16 bit word.
+    Loading a recording replays exactly the same ticks, so it needs the same
+    level file and tick rate it was recorded with.
+    """
+
+    def __init__(self, level: bytes, tick_rate: int, bounds: tuple[int, int]) -> None:
+        self.level = level
+        self.tick_rate = tick_rate
+        self.bounds = bounds
+        self.tick_count = 0
+        self.runs: list[list[int]] = []
+
+    def capture(self, simulation: LevelSimulation) -> None:
+        """Appends the input state the next step of simulation will run with."""
+        bits = 0
+        for index, player in enumerate(simulation.players):
+            bits |= player.input_bits() << (index * INPUT_BITS)
+        self.tick_count += 1
+        if self.runs and self.runs[-1][0] == bits and self.runs[-1][1] < MAX_RUN:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([bits, 1])
+
+    def ticks(self):
+        """Yields the input bits of every tick in order."""
+        for bits, count in self.runs:
+            for _ in range(count):
+                yield bits
+
+    def to_bytes(self) -> bytes:
+        width, height = self.bounds
+        header = HEADER.pack(
+            MAGIC, VERSION, self.tick_rate, width, height, self.level, self.tick_count
+        )
+        return header + b"".join(RUN.pack(bits, count) for bits, count in self.runs)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "InputRecording":
+        """Raises ValueError when data is not a recording this version can read."""
+        if len(data) < HEADER.size or (len(data) - HEADER.size) % RUN.size:
+            raise ValueError("truncated input recording")
+        magic, version, tick_rate, width, height, level, tick_count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not an input recording")
+        recording = cls(level, tick_rate, (width, height))
+        recording.runs = [list(run) for run in RUN.iter_unpack(data[HEADER.size:])]
+        recording.tick_count = sum(count for _, count in recording.runs)
+        if recording.tick_count != tick_count:
+            raise ValueError("truncated input recording")
+        return recording
+
+    def save(self, path: str) -> None:
+        temporary_path = path + ".tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(self.to_bytes())
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "InputRecording":
+        """Raises OSError or ValueError when the recording can't be read."""
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())
+
+
+def load_recorded_level(recording: InputRecording, level_path: str) -> LevelSimulation:
+    """Loads the level a recording was made on, ready to be stepped by replay_steps.
+
+    Raises OSError or json.JSONDecodeError when the level can't be read, and
+    ValueError when the level file is not the one the run was recorded on.
+    """
+    if level_digest(level_path) != recording.level:
+        raise ValueError(f"{level_path} is not the level this run was recorded on")
+    return LevelSimulation.from_file(level_path, recording.bounds)
+
+
+def replay_steps(recording: InputRecording, simulation: LevelSimulation):
+    """Steps simulation with the recorded inputs, yielding after every tick."""
+    dt = 1 / recording.tick_rate
+    mask = (1 << INPUT_BITS) - 1
+    players = simulation.players
+    for bits in recording.ticks():
+        for index, player in enumerate(players):
+            player.set_input_bits(bits >> (index * INPUT_BITS) & mask)
+        simulation.step(dt)
+        yield simulation
+
+
+def replay(recording: InputRecording, level_path: str) -> LevelSimulation:
+    """Re-simulates a recording as fast as possible and returns the finished simulation.
+
+    Raises the errors of load_recorded_level.
+    """
+    simulation = load_recorded_level(recording, level_path)
+    for _ in replay_steps(recording, simulation):
+        pass
+    return simulation
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = __doc__.splitlines()[0])
+    parser.add_argument("recording")
+    parser.add_argument("level")
+    args = parser.parse_args()
+
+    recording = InputRecording.load(args.recording)
+    started = time.perf_counter()
+    simulation = replay(recording, args.level)
+    elapsed = time.perf_counter() - started
+    print(f"{simulation.name}: complete={simulation.complete} "
+          f"time={simulation.elapsed:.3f}s points={simulation.total_points()}")
+    print(f"Replayed {recording.tick_count} ticks in {elapsed:.3f}s "
+          f"({recording.tick_count / max(elapsed, 1e-9):.0f} ticks/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+import json
+
+import pygame
+
+from others import TileType
+from simulation.player_body import PlayerBody
+from simulation.book_body import BookBody
+from simulation.snack_body import SnackBody
+from simulation.button_body import ButtonBody
+from simulation.spray_body import SprayBody
+from simulation.collision_map import CollisionMap
+from simulation.spatial_grid import SpatialGrid
+
+TILE_SIZE = 64
+# below this many books the per-book Python update is faster than the NumPy engine
+VECTORIZED_BOOKS_THRESHOLD = 64
+
+
+class LevelSimulation:
+    """The rules of one level, stepped without a display.
+
+    bounds is the world size in pixels. Inputs go through the player bodies'
+    press and release, and the simulation is advanced with step.
+    vectorized_books picks the NumPy BookPhysicsEngine for the books; by default
+    it is used once a level has VECTORIZED_BOOKS_THRESHOLD books.
+    links wires buttons to sprays as stored in the level file, a list of
+    {"button": [x, y], "sprays": [[x, y], ...]} in tiles; without it every
+    button turns off every spray.
+    """
+
+    def __init__(
+            self,
+            grid: list[list[TileType]],
+            bounds: tuple[int, int],
+            name: str = "Level",
+            vectorized_books: bool | None = None,
+            links: list[dict] | None = None
+        ) -> None:
+        self.grid = grid
+        self.name = name
+        self.bounds = bounds
+        self.tile_count_width: int = bounds[0] // TILE_SIZE
+        self.tile_count_height: int = bounds[1] // TILE_SIZE
+        self.collision = CollisionMap(grid)
+        self.players: list[PlayerBody] = []
+        self.books: list[BookBody] = []
+        # at most one snack per tile, so a player only looks at the tiles it covers
+        self.snack_tiles: dict[tuple[int, int], SnackBody] = {}
+        self.buttons: list[ButtonBody] = []
+        self.button_tiles: dict[tuple[int, int], ButtonBody] = {}
+        self.sprays: list[SprayBody] = []
+        self.collected_snacks: list[SnackBody] = []
+        self.complete: bool = False
+        self.elapsed: float = 0.0
+        self._spawn_entities()
+        self._link_buttons(links)
+        if vectorized_books is None:
+            vectorized_books = len(self.books) >= VECTORIZED_BOOKS_THRESHOLD
+        self.book_engine = None
+        if vectorized_books:
+            # NumPy is only imported by levels that need it, to keep it out of startup
+            from simulation.book_engine import BookPhysicsEngine
+            self.book_engine = BookPhysicsEngine(self.books, self.collision, bounds)
+            self.books = self.book_engine.books
+        self.book_grid = SpatialGrid([book.rect for book in self.books])
+
+        for player in self.players:
+            player.is_sleeping = player.is_near_bed(self.collision)
+        # the buttons each player touched at the end of the last step
+        self.button_contacts: list[tuple[ButtonBody, ...]] = [() for _ in self.players]
+        self._update_button_contacts()
+
+    @classmethod
+    def from_file(
+            cls,
+            level_path: str,
+            bounds: tuple[int, int],
+            vectorized_books: bool | None = None
+        ) -> "LevelSimulation":
+        """Raises OSError or json.JSONDecodeError when the level can't be read."""
+        with open(level_path, "r", encoding="utf-8") as level:
+            data = json.load(level)
+        grid = [[TileType(value) for value in row] for row in data.get("grid", [])]
+        return cls(
+            grid, bounds, data.get("name", "Level"), vectorized_books, data.get("links")
+        )
+
+    @property
+    def snacks(self) -> list[SnackBody]:
+        """The snacks not collected yet, in spawn order."""
+        return list(self.snack_tiles.values())
+
+    def is_valid(self) -> bool:
+        return (
+            len(self.grid) == self.tile_count_height
+            and all(len(row) == self.tile_count_width for row in self.grid)
+        )
+
+    def _tile_at(self, x: int, y: int) -> TileType:
+        if 0 <= y < len(self.grid) and 0 <= x < len(self.grid[y]):
+            return self.grid[y][x]
+        return TileType.INVALID
+
+    def _spawn_entities(self) -> None:
+        for y in range(self.tile_count_height):
+            for x in range(self.tile_count_width):
+                match self._tile_at(x, y):
+                    case TileType.BLUE_PLAYER:
+                        self.players.append(
+                            PlayerBody(TileType.BLUE_PLAYER, (x, y), TileType.BLUE_BED, self.bounds)
+                        )
+                    case TileType.RED_PLAYER:
+                        self.players.append(
+                            PlayerBody(TileType.RED_PLAYER, (x, y), TileType.RED_BED, self.bounds)
+                        )
+                    case TileType.SNACK:
+                        self.snack_tiles[(x, y)] = SnackBody(x, y)
+                    case TileType.BOOKS:
+                        self.books.append(BookBody(x, y, self.bounds))
+                    case TileType.BUTTON:
+                        button = ButtonBody(x, y)
+                        self.buttons.append(button)
+                        self.button_tiles[(x, y)] = button
+                    case TileType.SPRAY:
+                        height: int = 1
+                        while (
+                            y - height >= 0
+                            and self._tile_at(x, y - height) in (TileType.EMPTY, TileType.SNACK)
+                        ):
+                            height += 1
+                        self.sprays.append(SprayBody(x, y, height))
+
+    def _link_buttons(self, links: list[dict] | None) -> None:
+        if links is None:
+            for button in self.buttons:
+                button.targets = list(self.sprays)
+            return
+        sprays = {(spray.base_x, spray.base_y): spray for spray in self.sprays}
+        for link in links:
+            button = self.button_tiles.get(tuple(link.get("button", ())))
+            if button is None:
+                continue
+            for position in link.get("sprays", []):
+                spray = sprays.get(tuple(position))
+                if spray is not None and spray not in button.targets:
+                    button.targets.append(spray)
+
+    def total_points(self) -> int:
+        return sum(player.points for player in self.players)
+
+    def _collect_snacks(self, player: PlayerBody) -> None:
+        for tile in self.collision.overlapping_tiles(player.rect):
+            snack = self.snack_tiles.get(tile)
+            if snack is not None and snack.is_colliding_with(player.rect):
+                player.points += 1
+                del self.snack_tiles[tile]
+                self.collected_snacks.append(snack)
+
+    def _update_button_contacts(self) -> None:
+        for index, player in enumerate(self.players):
+            touching = tuple(
+                button
+                for tile in self.collision.overlapping_tiles(player.rect)
+                if (button := self.button_tiles.get(tile)) is not None
+                and button.is_colliding_with(player.rect)
+            )
+            previous = self.button_contacts[index]
+            if touching == previous:
+                continue
+            for button in previous:
+                if button not in touching:
+                    button.remove_contact()
+            for button in touching:
+                if button not in previous:
+                    button.add_contact()
+            self.button_contacts[index] = touching
+
+    def snapshot(self) -> tuple:
+        """Returns the moving state of the level, for restore to go back to.
+
+        Only the per-book update is covered, not the NumPy book engine.
+        """
+        bodies = (*self.players, *self.books, *self.buttons, *self.sprays)
+        return (
+            [_body_state(body) for body in bodies],
+            dict(self.snack_tiles),
+            list(self.button_contacts),
+            self.complete,
+            self.elapsed,
+        )
+
+    def restore(self, snapshot: tuple) -> None:
+        body_states, snack_tiles, button_contacts, self.complete, self.elapsed = snapshot
+        bodies = (*self.players, *self.books, *self.buttons, *self.sprays)
+        for body, state in zip(bodies, body_states):
+            _set_body_state(body, state)
+        self.snack_tiles = dict(snack_tiles)
+        self.button_contacts = list(button_contacts)
+        self.collected_snacks.clear()
+        self.book_grid.update()
+
+    def step(self, dt: float) -> None:
+        self.collected_snacks.clear()
+        if self.book_engine is not None:
+            self.book_engine.step(dt, self.players)
+            self.book_grid.update(self.book_engine.moved)
+        else:
+            for book in self.books:
+                book.update(dt, self.collision, self.players)
+            self.book_grid.update()
+
+        for spray in self.sprays:
+            spray.update(self.players)
+
+        for player in self.players:
+            player.update(dt, self.collision, self.book_grid)
+            if self.snack_tiles:
+                self._collect_snacks(player)
+
+        if self.button_tiles:
+            self._update_button_contacts()
+
+        if self.complete:
+            return
+        self.elapsed += dt
+        if all(player.is_sleeping for player in self.players):
+            self.complete = True
+            for player in self.players:
+                player.stop()
+
+
+def _body_state(body) -> tuple:
+    return tuple(
+        value.copy() if isinstance(value, pygame.Rect) else value
+        for value in (getattr(body, name) for name in body.__slots__)
+    )
+
+
+def _set_body_state(body, state: tuple) -> None:
+    for name, value in zip(body.__slots__, state):
+        current = getattr(body, name)
+        if isinstance(value, pygame.Rect) and isinstance(current, pygame.Rect):
+            # rects are shared with the book grid, so they are changed in place
+            current.update(value)
+        elif isinstance(value, pygame.Rect):
+            setattr(body, name, value.copy())
+        else:
+            setattr(body, name, value)
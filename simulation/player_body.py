@@ -0,0 +1,171 @@
+import pygame
+
+from others import ControlsType
+from simulation.facing import Facing
+
+TILE_SIZE = 64
+# moving_left, moving_right and jump_pressed, at their ControlsType bit
+INPUT_BITS = 3
+
+class PlayerBody:
+    __slots__ = (
+        "tile_type", "rect", "initial_pos", "x", "y", "previous_pos", "facing", "bounds",
+        "corresponding_bed", "is_sleeping", "points", "moving_left", "moving_right",
+        "jump_pressed", "is_jumping", "velocity", "prev_rect"
+    )
+
+    speed = 200
+    jump_velocity = -670
+    gravity = 900
+
+    def __init__(self, tile_type, grid_pos, bed, bounds):
+        self.tile_type = tile_type
+        self.rect = pygame.Rect(
+            grid_pos[0] * TILE_SIZE,
+            grid_pos[1] * TILE_SIZE,
+            TILE_SIZE,
+            TILE_SIZE
+        )
+        self.initial_pos = (grid_pos[0] * TILE_SIZE, grid_pos[1] * TILE_SIZE)
+        # the rect is the rounded float position; previous_pos is kept for render interpolation
+        self.x = float(self.rect.x)
+        self.y = float(self.rect.y)
+        self.previous_pos = (self.x, self.y)
+        self.facing = Facing.LEFT
+        self.bounds = bounds
+        self.corresponding_bed = bed
+        self.is_sleeping = False
+        self.points = 0
+
+        self.moving_left  = False
+        self.moving_right = False
+        self.jump_pressed = False
+
+        self.is_jumping = False
+        self.velocity = 0
+        self.prev_rect = None
+
+    def press(self, control):
+        if control == ControlsType.LEFT:
+            self.moving_left = True
+        elif control == ControlsType.RIGHT:
+            self.moving_right = True
+        elif control == ControlsType.JUMP and not self.is_jumping:
+            self.jump_pressed = True
+
+    def release(self, control):
+        if control == ControlsType.LEFT:
+            self.moving_left = False
+        elif control == ControlsType.RIGHT:
+            self.moving_right = False
+
+    def input_bits(self):
+        return (
+            self.moving_left << ControlsType.LEFT
+            | self.moving_right << ControlsType.RIGHT
+            | self.jump_pressed << ControlsType.JUMP
+        )
+
+    def set_input_bits(self, bits):
+        self.moving_left = bool(bits >> ControlsType.LEFT & 1)
+        self.moving_right = bool(bits >> ControlsType.RIGHT & 1)
+        self.jump_pressed = bool(bits >> ControlsType.JUMP & 1)
+
+    def respawn(self):
+        self.rect.topleft = self.initial_pos
+        self._sync_x()
+        self._sync_y()
+        self.previous_pos = (self.x, self.y)
+        self.velocity = 0
+        self.is_jumping = False
+        self.moving_left  = False
+        self.moving_right = False
+
+    def stop(self):
+        self.moving_left  = False
+        self.moving_right = False
+        self.jump_pressed = False
+
+    def _sync_x(self):
+        self.x = float(self.rect.x)
+
+    def _sync_y(self):
+        self.y = float(self.rect.y)
+
+    def _check_bottom(self):
+        if self.rect.bottom > self.bounds[1]:
+            self.rect.bottom = self.bounds[1]
+            self._sync_y()
+            self.velocity = 0
+            self.is_jumping = False
+
+    def _check_top(self):
+        if self.rect.top < 0:
+            self.rect.top = 0
+            self._sync_y()
+            self.velocity = 0
+
+    def update_jump(self, dt, collision, books):
+        if self.jump_pressed and not self.is_jumping:
+            self.velocity = self.jump_velocity
+            self.is_jumping = True
+        self.jump_pressed = False
+
+        self.velocity += self.gravity * dt
+        self.y += self.velocity * dt
+        self.rect.y = round(self.y)
+
+        for floor_top in collision.floor_tops_at(self.rect):
+            if self.rect.colliderect(floor_top):
+                if self.velocity > 0 and self.prev_rect.bottom <= floor_top.top:
+                    self.rect.bottom = floor_top.top
+                    self._sync_y()
+                    self.velocity = 0
+                    self.is_jumping = False
+                elif self.velocity < 0 and self.prev_rect.top >= floor_top.bottom:
+                    self.rect.top = floor_top.bottom
+                    self._sync_y()
+                    self.velocity = 0
+
+        # snapping only moves the rect back towards prev_rect,
+        # so their union holds every book it can hit
+        for book_rect in books.query(self.rect.union(self.prev_rect)):
+            if self.rect.colliderect(book_rect):
+                if self.velocity > 0 and self.prev_rect.bottom <= book_rect.top:
+                    self.rect.bottom = book_rect.top
+                    self._sync_y()
+                    self.velocity = 0
+                    self.is_jumping = False
+                elif self.velocity < 0 and self.prev_rect.top >= book_rect.bottom:
+                    self.rect.top = book_rect.bottom
+                    self._sync_y()
+                    self.velocity = 0
+
+    def update_move(self, dt, collision):
+        if self.moving_left:
+            self.x = max(self.x - self.speed * dt, 0)
+            self.facing = Facing.LEFT
+        elif self.moving_right:
+            self.x = min(self.x + self.speed * dt, self.bounds[0] - self.rect.width)
+            self.facing = Facing.RIGHT
+        self.rect.x = round(self.x)
+
+        for floor_top in collision.floor_tops_at(self.rect):
+            if self.rect.colliderect(floor_top):
+                if self.facing == Facing.RIGHT:
+                    self.rect.right = floor_top.left
+                elif self.facing == Facing.LEFT:
+                    self.rect.left = floor_top.right
+                self._sync_x()
+
+    def is_near_bed(self, collision):
+        return collision.touches_tile(self.rect, self.corresponding_bed)
+
+    def update(self, dt, collision, books):
+        self.prev_rect = self.rect.copy()
+        self.previous_pos = (self.x, self.y)
+        self.update_move(dt, collision)
+        self.update_jump(dt, collision, books)
+        self._check_bottom()
+        self._check_top()
+        self.is_sleeping = self.is_near_bed(collision)
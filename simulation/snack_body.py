@@ -0,0 +1,29 @@
+import pygame
+
+TILE_SIZE = 64
+
+class SnackBody:
+    __slots__ = ("x", "y", "rect", "collide_rect")
+
+    collision_size = 32
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.rect = pygame.Rect(
+            x * TILE_SIZE,
+            y * TILE_SIZE,
+            TILE_SIZE,
+            TILE_SIZE
+        )
+
+        offset = (TILE_SIZE - self.collision_size) // 2
+        self.collide_rect = pygame.Rect(
+            self.rect.x + offset,
+            self.rect.y,
+            self.collision_size,
+            self.collision_size
+        )
+
+    def is_colliding_with(self, player_rect):
+        return self.collide_rect.colliderect(player_rect)
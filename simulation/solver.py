@@ -0,0 +1,438 @@
+"""Checks whether both cats of a level can reach their beds.
+
+Usage: python -m simulation.solver [LEVEL ...] [--time-limit 10] [--workers N]
+
+Without levels every level in levels/ is checked, one per worker process.
+"""
+
+import argparse
+import heapq
+import json
+import math
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from functools import partial
+from itertools import count
+from typing import Callable
+
+from others import ControlsType, TileType
+from simulation.level_simulation import LevelSimulation
+from simulation.button_body import ButtonBody
+from simulation.player_body import PlayerBody
+
+TILE_SIZE = 64
+TICK = 1 / 60
+# ticks an action is held for, one edge of the search
+ACTION_TICKS = 12
+# pixels that are treated as the same position when states are compared
+POSITION_STEP = 32
+MAX_STATES = 200000
+RESTING_VELOCITY = 60
+# parts of the time limit spent on sending the cats to bed one at a time,
+# and on letting one of them hold a button for the others first
+TURNS_TIME_SHARE = 0.25
+HELPERS_TIME_SHARE = 0.25
+
+ACTIONS: tuple[tuple[ControlsType, ...], ...] = (
+    (ControlsType.LEFT,),
+    (ControlsType.RIGHT,),
+    (ControlsType.JUMP,),
+    (ControlsType.JUMP, ControlsType.LEFT),
+    (ControlsType.JUMP, ControlsType.RIGHT),
+)
+
+
+class SolveResult(Enum):
+    SOLVABLE = "solvable"
+    UNSOLVABLE = "unsolvable"
+    TIMEOUT = "timeout"
+
+
+def _state_key(simulation: LevelSimulation) -> tuple:
+    """The discretised state, equal for states the search treats as the same.
+
+    Snacks are left out since they don't change where the cats can go.
+    """
+    players = tuple(
+        (
+            player.rect.x // POSITION_STEP,
+            player.rect.y // POSITION_STEP,
+            round(player.velocity / 200) if _in_air(player) else None,
+        )
+        for player in simulation.players
+    )
+    books = tuple(
+        (book.rect.x // POSITION_STEP, book.rect.y // POSITION_STEP) for book in simulation.books
+    )
+    buttons = tuple(button.pressed for button in simulation.buttons)
+    return players, books, buttons
+
+
+def _bed_in_reach(grid: list[list[TileType]], player: PlayerBody) -> bool:
+    """Whether the cat could touch its bed if nothing but floors were in its way.
+
+    The standing spots are walked and jumped between with the highest and
+    longest jump a cat can make, without checking what is in the way, so a
+    False means no moves at all get the cat there. Books only land on floors,
+    so a book pushed under the cat lifts it a tile, never more.
+    """
+    height = len(grid)
+    width = len(grid[0]) if grid else 0
+    books = any(TileType.BOOKS in row for row in grid)
+    jump_height = PlayerBody.jump_velocity ** 2 / (2 * PlayerBody.gravity)
+    # rows a jump can land on above the start, and rows it touches
+    rise = math.floor(jump_height / TILE_SIZE)
+    reach = math.ceil(jump_height / TILE_SIZE)
+    # tiles moved sideways during a jump, plus one as the cat can stand across two tiles
+    air_time = 2 * -PlayerBody.jump_velocity / PlayerBody.gravity
+    air_tiles = math.ceil(air_time * PlayerBody.speed / TILE_SIZE) + 1
+    beds = [
+        (x, y) for y, row in enumerate(grid) for x, tile in enumerate(row)
+        if tile == player.corresponding_bed
+    ]
+
+    def on_floor(x: int, y: int) -> bool:
+        return grid[y][x] != TileType.FLOOR and (
+            y == height - 1 or grid[y + 1][x] == TileType.FLOOR
+        )
+
+    def standing(x: int, y: int) -> bool:
+        return on_floor(x, y) or (
+            books and y < height - 1 and grid[y][x] != TileType.FLOOR and on_floor(x, y + 1)
+        )
+
+    def touchable(bed_x: int, bed_y: int, y: int) -> bool:
+        # a cat only overlaps a bed resting on a floor once it is as high as the bed
+        if bed_y < height - 1 and grid[bed_y + 1][bed_x] == TileType.FLOOR:
+            return y - rise <= bed_y <= y
+        return y - reach <= bed_y <= y
+
+    start = (player.rect.x // TILE_SIZE, height - 1)
+    for y in range(player.rect.y // TILE_SIZE, height):
+        if standing(start[0], y):
+            start = (start[0], y)
+            break
+    spots = [(x, y) for y in range(height) for x in range(width) if standing(x, y)]
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        for bed_x, bed_y in beds:
+            if touchable(bed_x, bed_y, y) and abs(bed_x - x) <= air_tiles:
+                return True
+        for spot_x, spot_y in spots:
+            # falling further leaves more time to move sideways, a tile per row is plenty
+            if (
+                (spot_x, spot_y) not in seen
+                and spot_y >= y - rise
+                and abs(spot_x - x) <= air_tiles + max(spot_y - y, 0)
+            ):
+                seen.add((spot_x, spot_y))
+                queue.append((spot_x, spot_y))
+    return False
+
+
+def _distances_to(
+        grid: list[list[TileType]],
+        targets: list[tuple[int, int]]
+    ) -> dict[tuple[int, int], int]:
+    """Steps from every open tile to the nearest target tile, going around floors."""
+    distances = {target: 0 for target in targets}
+    queue = deque(distances)
+    while queue:
+        x, y = queue.popleft()
+        for neighbour in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            next_x, next_y = neighbour
+            if (
+                neighbour not in distances
+                and 0 <= next_y < len(grid)
+                and 0 <= next_x < len(grid[next_y])
+                and grid[next_y][next_x] != TileType.FLOOR
+            ):
+                distances[neighbour] = distances[(x, y)] + 1
+                queue.append(neighbour)
+    return distances
+
+
+def _bed_distances(grid: list[list[TileType]], bed: TileType) -> dict[tuple[int, int], int]:
+    return _distances_to(
+        grid, [(x, y) for y, row in enumerate(grid) for x, tile in enumerate(row) if tile == bed]
+    )
+
+
+def _tile_distance(
+        simulation: LevelSimulation,
+        index: int,
+        distances: dict[tuple[int, int], int]
+    ) -> float:
+    rect = simulation.players[index].rect
+    return distances.get((rect.centerx // TILE_SIZE, rect.centery // TILE_SIZE), float("inf"))
+
+
+def _distance(
+        simulation: LevelSimulation,
+        movers: list[int],
+        distances: dict[TileType, dict[tuple[int, int], int]]
+    ) -> float:
+    """Tiles the awake cats in movers still have to travel to their beds."""
+    total = 0.0
+    for index in movers:
+        player = simulation.players[index]
+        if not player.is_sleeping:
+            total += _tile_distance(simulation, index, distances[player.corresponding_bed])
+    return total
+
+
+def _in_air(player) -> bool:
+    # a cat resting on the ground gathers a few ticks of gravity before it is snapped back
+    return player.is_jumping or player.velocity > RESTING_VELOCITY
+
+
+def _airborne(simulation: LevelSimulation) -> int | None:
+    for index, player in enumerate(simulation.players):
+        if _in_air(player):
+            return index
+    return None
+
+
+def _asleep(sleepers: list[int]) -> Callable[[LevelSimulation], bool]:
+    """The goal of every cat in sleepers sleeping.
+
+    Unless that is every cat, the goal also has to be on the ground so the
+    next search can start from it.
+    """
+    def goal(simulation: LevelSimulation) -> bool:
+        players = simulation.players
+        return all(players[index].is_sleeping for index in sleepers) and (
+            len(sleepers) == len(players) or _airborne(simulation) is None
+        )
+    return goal
+
+
+def _on_button(player_index: int, button: ButtonBody) -> Callable[[LevelSimulation], bool]:
+    """The goal of a cat standing on button."""
+    def goal(simulation: LevelSimulation) -> bool:
+        return (
+            button in simulation.button_contacts[player_index]
+            and _airborne(simulation) is None
+        )
+    return goal
+
+
+def _act(
+        simulation: LevelSimulation,
+        player_index: int | None,
+        action: tuple[ControlsType, ...]
+    ) -> None:
+    for player in simulation.players:
+        player.stop()
+    if player_index is not None:
+        for control in action:
+            simulation.players[player_index].press(control)
+    for _ in range(ACTION_TICKS):
+        simulation.step(TICK)
+
+
+def _search(
+        simulation: LevelSimulation,
+        start: tuple,
+        movers: list[int],
+        goal: Callable[[LevelSimulation], bool],
+        distance: Callable[[LevelSimulation], float],
+        deadline: float,
+        max_states: int
+    ) -> tuple[SolveResult, tuple | None]:
+    """Best-first search moving the cats in movers until goal holds.
+
+    States with the smallest distance are expanded first. Returns the result
+    and, when solvable, the snapshot the goal was reached in.
+    """
+    players = simulation.players
+    simulation.restore(start)
+    if goal(simulation):
+        return SolveResult.SOLVABLE, start
+    order = count()
+    seen = {_state_key(simulation)}
+    frontier = [(distance(simulation), next(order), _airborne(simulation), start)]
+    moves = [(None, ())] + [(index, action) for index in movers for action in ACTIONS]
+    # a cat in the air can only steer, and the others wait for it to land
+    air_moves = [
+        [(None, ()), (index, (ControlsType.LEFT,)), (index, (ControlsType.RIGHT,))]
+        for index in range(len(players))
+    ]
+
+    while frontier:
+        if time.perf_counter() > deadline or len(seen) > max_states:
+            return SolveResult.TIMEOUT, None
+        _, _, airborne, snapshot = heapq.heappop(frontier)
+        for player_index, action in moves if airborne is None else air_moves[airborne]:
+            simulation.restore(snapshot)
+            _act(simulation, player_index, action)
+            if goal(simulation):
+                return SolveResult.SOLVABLE, simulation.snapshot()
+            key = _state_key(simulation)
+            if key in seen:
+                continue
+            seen.add(key)
+            heapq.heappush(frontier, (
+                distance(simulation),
+                next(order),
+                _airborne(simulation),
+                simulation.snapshot()
+            ))
+    return SolveResult.UNSOLVABLE, None
+
+
+def _plan(
+        simulation: LevelSimulation,
+        start: tuple,
+        legs: list[tuple[int, Callable, Callable]],
+        deadline: float,
+        max_states: int
+    ) -> SolveResult:
+    """Runs one search per (mover, goal, distance) leg, each from where the last one ended."""
+    snapshot = start
+    for index, goal, distance in legs:
+        result, snapshot = _search(
+            simulation, snapshot, [index], goal, distance, deadline, max_states
+        )
+        if result != SolveResult.SOLVABLE:
+            return result
+    return SolveResult.SOLVABLE
+
+
+def solve(
+        grid: list[list[TileType]],
+        links: list[dict] | None = None,
+        time_limit: float = 10.0,
+        max_states: int = MAX_STATES
+    ) -> SolveResult:
+    """Searches the moves of the cats for a way to put them all in their beds.
+
+    Every edge holds one cat's action, or nothing, for ACTION_TICKS ticks of
+    the real LevelSimulation, so jumps, book pushing and buttons behave as in
+    the game. States are compared by _state_key and each is expanded once,
+    nearest to the goal first.
+
+    Searching one cat at a time is far cheaper than searching all of them
+    together, so it is tried first, each part of the search with its share
+    of time_limit:
+
+    - the cats go to bed one after the other, in every turn order;
+    - one cat stands on a button while the others go to bed, then follows.
+
+    Without books or buttons nothing a cat does changes where the others can
+    go, so the first turn order alone decides the level. Otherwise the rest
+    of the time goes to a search over the moves of all cats together.
+    """
+    bounds = (len(grid[0]) * TILE_SIZE if grid else 0, len(grid) * TILE_SIZE)
+    simulation = LevelSimulation(grid, bounds, vectorized_books = False, links = links)
+    players = simulation.players
+    if not players:
+        return SolveResult.UNSOLVABLE
+    if all(player.is_sleeping for player in players):
+        return SolveResult.SOLVABLE
+
+    distances = {
+        player.corresponding_bed: _bed_distances(grid, player.corresponding_bed)
+        for player in players
+    }
+    if (
+        _distance(simulation, list(range(len(players))), distances) == float("inf")
+        or not all(_bed_in_reach(grid, player) for player in players)
+    ):
+        return SolveResult.UNSOLVABLE
+
+    started = time.perf_counter()
+    start = simulation.snapshot()
+    indices = list(range(len(players)))
+
+    def to_bed(index: int, sleepers: list[int]) -> tuple[int, Callable, Callable]:
+        return index, _asleep(sleepers), partial(_distance, movers = [index], distances = distances)
+
+    turns_deadline = started + time_limit * TURNS_TIME_SHARE
+    for first in indices:
+        turns = indices[first:] + indices[:first]
+        result = _plan(
+            simulation, start,
+            [to_bed(index, turns[:turn + 1]) for turn, index in enumerate(turns)],
+            turns_deadline, max_states
+        )
+        if result == SolveResult.SOLVABLE:
+            return result
+        if not simulation.books and not simulation.buttons:
+            return result
+
+    button_distances = {
+        button: _distances_to(grid, [(button.x, button.y)]) for button in simulation.buttons
+    }
+    helpers_deadline = time.perf_counter() + time_limit * HELPERS_TIME_SHARE
+    for helper in indices:
+        others = [index for index in indices if index != helper]
+        # the nearest buttons first, the ones behind sprays take a whole search to rule out
+        buttons = sorted(
+            simulation.buttons,
+            key = lambda button: _tile_distance(simulation, helper, button_distances[button])
+        )
+        for button in buttons:
+            legs = [(
+                helper,
+                _on_button(helper, button),
+                partial(_tile_distance, index = helper, distances = button_distances[button])
+            )]
+            legs += [to_bed(index, others[:turn + 1]) for turn, index in enumerate(others)]
+            legs.append(to_bed(helper, indices))
+            if _plan(
+                simulation, start, legs, helpers_deadline, max_states
+            ) == SolveResult.SOLVABLE:
+                return SolveResult.SOLVABLE
+
+    return _search(
+        simulation, start, indices, _asleep(indices),
+        partial(_distance, movers = indices, distances = distances),
+        started + time_limit, max_states
+    )[0]
+
+
+def solve_file(level_path: str, time_limit: float = 10.0) -> SolveResult:
+    """Raises OSError or json.JSONDecodeError when the level can't be read."""
+    with open(level_path, "r", encoding="utf-8") as level:
+        data = json.load(level)
+    grid = [[TileType(value) for value in row] for row in data.get("grid", [])]
+    return solve(grid, data.get("links"), time_limit)
+
+
+def solve_files(
+        level_paths: list[str],
+        time_limit: float = 10.0,
+        workers: int | None = None
+    ) -> dict[str, SolveResult]:
+    """Checks every level in its own worker process."""
+    with ProcessPoolExecutor(max_workers = workers) as pool:
+        results = pool.map(solve_file, level_paths, [time_limit] * len(level_paths))
+        return dict(zip(level_paths, results))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = __doc__.splitlines()[0])
+    parser.add_argument("levels", nargs = "*")
+    parser.add_argument("--time-limit", type = float, default = 10.0)
+    parser.add_argument("--workers", type = int)
+    args = parser.parse_args()
+
+    level_paths = args.levels or [
+        os.path.join("levels", file)
+        for file in sorted(os.listdir("levels"))
+        if file.endswith(".json")
+    ]
+    started = time.perf_counter()
+    for level_path, result in solve_files(level_paths, args.time_limit, args.workers).items():
+        print(f"{level_path:<40} {result.value}")
+    print(f"Checked {len(level_paths)} levels in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
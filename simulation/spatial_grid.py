@@ -0,0 +1,63 @@
+import pygame
+
+TILE_SIZE = 64
+
+
+class SpatialGrid:
+    """Uniform grid of cells holding the rects of moving bodies.
+
+    A body is only moved between cells when the cells its rect covers change,
+    and query only looks at the cells a rect covers, so the cost per body
+    depends on how crowded its area is and not on how many bodies there are.
+    """
+
+    def __init__(self, rects: list[pygame.Rect], cell_size: int = TILE_SIZE) -> None:
+        self.cell_size = cell_size
+        self.rects = rects
+        self.cells: dict[tuple[int, int], list[int]] = {}
+        self.spans: list[tuple[int, int, int, int] | None] = [None] * len(rects)
+        self.update()
+
+    def _span(self, rect: pygame.Rect) -> tuple[int, int, int, int]:
+        size = self.cell_size
+        return (
+            rect.left // size,
+            rect.top // size,
+            (rect.right - 1) // size,
+            (rect.bottom - 1) // size
+        )
+
+    @staticmethod
+    def _cells(span: tuple[int, int, int, int]):
+        left, top, right, bottom = span
+        for y in range(top, bottom + 1):
+            for x in range(left, right + 1):
+                yield x, y
+
+    def update(self, indices: list[int] | None = None) -> None:
+        """Moves the rects whose cells changed since the last update.
+
+        indices limits the check to the rects known to have moved.
+        """
+        if indices is None:
+            indices = range(len(self.rects))
+        for index in indices:
+            span = self._span(self.rects[index])
+            previous = self.spans[index]
+            if span == previous:
+                continue
+            if previous is not None:
+                for cell in self._cells(previous):
+                    self.cells[cell].remove(index)
+            for cell in self._cells(span):
+                self.cells.setdefault(cell, []).append(index)
+            self.spans[index] = span
+
+    def query(self, rect: pygame.Rect) -> list[pygame.Rect]:
+        """Returns the rects sharing a cell with rect, in the order they were given."""
+        found: set[int] = set()
+        for cell in self._cells(self._span(rect)):
+            indices = self.cells.get(cell)
+            if indices:
+                found.update(indices)
+        return [self.rects[index] for index in sorted(found)]
@@ -0,0 +1,34 @@
+import pygame
+
+TILE_SIZE = 64
+
+class SprayBody:
+    __slots__ = ("base_x", "base_y", "height", "active", "held", "collide_rect")
+
+    def __init__(self, x, y, height):
+        self.base_x = x
+        self.base_y = y
+        self.height = height
+        self.active = True
+        # how many of the buttons wired to this spray are pressed
+        self.held = 0
+        self.collide_rect = pygame.Rect(
+            x * TILE_SIZE,
+            (y - height + 1) * TILE_SIZE,
+            TILE_SIZE, height * TILE_SIZE
+        )
+
+    def trigger_pressed(self):
+        self.held += 1
+        self.active = False
+
+    def trigger_released(self):
+        self.held -= 1
+        self.active = self.held == 0
+
+    def update(self, players):
+        if not self.active:
+            return
+        for player in players:
+            if self.collide_rect.colliderect(player.rect):
+                player.respawn()
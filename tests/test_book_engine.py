@@ -0,0 +1,39 @@
+from others import ControlsType, TileType
+from simulation import LevelSimulation
+
+E, F, B = TileType.EMPTY, TileType.FLOOR, TileType.BOOKS
+TICK = 1 / 60
+
+
+def _states(simulation):
+    return [
+        (tuple(book.rect), book.x, book.y, book.velocity, book.on_ground)
+        for book in simulation.books
+    ]
+
+
+def test_numpy_engine_matches_per_book_update():
+    grid = [
+        [E, B, E, E, B, E],
+        [E, E, E, B, E, E],
+        [TileType.BLUE_PLAYER, B, E, E, E, B],
+        [F, F, F, F, E, F],
+        [E, E, E, E, E, E],
+    ]
+    bounds = (6 * 64, 5 * 64)
+    scalar = LevelSimulation([row[:] for row in grid], bounds, vectorized_books = False)
+    vectorized = LevelSimulation([row[:] for row in grid], bounds, vectorized_books = True)
+    assert vectorized.book_engine is not None
+
+    for simulation in (scalar, vectorized):
+        simulation.players[0].press(ControlsType.RIGHT)
+    for step in range(240):
+        if step == 120:
+            for simulation in (scalar, vectorized):
+                simulation.players[0].press(ControlsType.JUMP)
+        scalar.step(TICK)
+        vectorized.step(TICK)
+        assert _states(scalar) == _states(vectorized)
+        assert scalar.players[0].rect == vectorized.players[0].rect
+
+    assert scalar.books[3].x > 64
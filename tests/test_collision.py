@@ -0,0 +1,29 @@
+import pygame
+
+from others import TileType
+from simulation import CollisionMap, SpatialGrid
+
+TILE_SIZE = 64
+
+
+def test_floor_tops_cover_grids_wider_than_the_screen():
+    grid = [[TileType.EMPTY] * 20, [TileType.FLOOR] * 20]
+    collision = CollisionMap(grid)
+    rect = pygame.Rect(18 * TILE_SIZE + 10, TILE_SIZE - 5, TILE_SIZE, TILE_SIZE)
+    floor_tops = collision.floor_tops_at(rect)
+    assert [floor_top.x // TILE_SIZE for floor_top in floor_tops] == [18, 19]
+    assert collision.touches_tile(rect, TileType.FLOOR)
+    assert not collision.touches_tile(pygame.Rect(0, 0, 10, 10), TileType.FLOOR)
+
+
+def test_spatial_grid_follows_moving_rects():
+    first = pygame.Rect(0, 0, TILE_SIZE, TILE_SIZE)
+    second = pygame.Rect(5 * TILE_SIZE, 0, TILE_SIZE, TILE_SIZE)
+    grid = SpatialGrid([first, second])
+    probe = pygame.Rect(5 * TILE_SIZE, 0, 1, 1)
+    assert grid.query(probe) == [second]
+
+    first.x = 5 * TILE_SIZE - 10
+    grid.update()
+    assert grid.query(probe) == [first, second]
+    assert grid.query(pygame.Rect(0, 0, 1, 1)) == []
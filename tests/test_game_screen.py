@@ -0,0 +1,74 @@
+import json
+import os
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+pygame.display.init()
+pygame.font.init()
+
+from others import Assets, ControlsType, TileType
+from simulation import GhostStore, InputRecording, LevelSimulation, level_digest
+from screens.gameplay import GameScreen
+
+LEVEL_PATH = os.path.join("levels", sorted(os.listdir("levels"))[0])
+
+
+def _game_screen(tmp_path: Path) -> GameScreen:
+    # other tests leave a smaller display behind
+    pygame.display.set_mode((960, 960))
+    game_screen = GameScreen(pygame.font.Font(None, 48), pygame.font.Font(None, 24), Assets())
+    game_screen.history_path = str(tmp_path / "history.json")
+    return game_screen
+
+
+def test_loading_a_level_resets_the_previous_one(tmp_path: Path):
+    broken_path = tmp_path / "broken.json"
+    broken_path.write_text(json.dumps({"name": "broken", "grid": [[0]]}), encoding="utf-8")
+    game_screen = _game_screen(tmp_path)
+
+    game_screen.load_level(str(broken_path))
+    assert game_screen.has_error
+    game_screen.load_level(LEVEL_PATH)
+    assert not game_screen.has_error
+
+    game_screen.level_complete = True
+    game_screen.load_level(LEVEL_PATH)
+    assert not game_screen.level_complete
+    game_screen.update(1 / 60)
+    assert game_screen.recording is not None
+
+
+def test_ghost_keeps_its_speed_at_another_tick_rate(tmp_path: Path):
+    grid = [[TileType.EMPTY] * 15 for _ in range(14)] + [[TileType.FLOOR] * 15]
+    grid[13][0] = TileType.BLUE_PLAYER
+    grid[13][13] = grid[13][14] = TileType.BLUE_BED
+    level_path = str(tmp_path / "level.json")
+    with open(level_path, "w", encoding="utf-8") as file:
+        json.dump({"grid": [[tile.value for tile in row] for row in grid]}, file)
+
+    # the ghost walks right for 1.5 s at 60 Hz
+    simulation = LevelSimulation.from_file(level_path, (960, 960))
+    recording = InputRecording(level_digest(level_path), 60, (960, 960))
+    simulation.players[0].press(ControlsType.RIGHT)
+    for _ in range(90):
+        recording.capture(simulation)
+        simulation.step(1 / 60)
+    ghost_path = str(tmp_path / "run.ghost")
+    GhostStore.build(ghost_path, recording, level_path)
+
+    game_screen = _game_screen(tmp_path)
+    game_screen.load_level(level_path)
+    game_screen.ghost = GhostStore(ghost_path)
+    try:
+        # one second of a 120 Hz game shows the ghost one second in, tick 60 of 60 Hz
+        for _ in range(120):
+            game_screen.update(1 / 120)
+        (_, position), = game_screen._ghost_targets()
+        x, y, _ = game_screen.ghost.frame(59)[0]
+        assert position == (x, y)
+        assert x != game_screen.ghost.frame(89)[0][0]
+    finally:
+        game_screen.ghost.close()
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from others import ControlsType, PoseType, TileType
+from simulation import GhostStore, InputRecording, LevelSimulation, level_digest
+
+E, F = TileType.EMPTY, TileType.FLOOR
+TICK = 1 / 60
+BOUNDS = (4 * 64, 3 * 64)
+
+
+def _record(tmp_path, ticks):
+    grid = [
+        [E, E, E, E],
+        [TileType.BLUE_PLAYER, E, TileType.BLUE_BED, TileType.BLUE_BED],
+        [F, F, F, F],
+    ]
+    level_path = str(tmp_path / "level.json")
+    with open(level_path, "w", encoding="utf-8") as file:
+        json.dump({"grid": [[tile.value for tile in row] for row in grid]}, file)
+
+    simulation = LevelSimulation.from_file(level_path, BOUNDS)
+    recording = InputRecording(level_digest(level_path), 60, BOUNDS)
+    simulation.players[0].press(ControlsType.RIGHT)
+    positions = []
+    for _ in range(ticks):
+        recording.capture(simulation)
+        simulation.step(TICK)
+        positions.append(simulation.players[0].rect.topleft)
+    return level_path, recording, positions
+
+
+def test_ghost_frames_match_the_recorded_run(tmp_path):
+    level_path, recording, positions = _record(tmp_path, 90)
+    ghost_path = str(tmp_path / "run.ghost")
+    GhostStore.build(ghost_path, recording, level_path)
+
+    ghost = GhostStore(ghost_path)
+    try:
+        assert ghost.frame_count == 90
+        for tick in (0, 17, 45):
+            x, y, _ = ghost.frame(tick)[0]
+            assert (x, y) == positions[tick]
+        assert ghost.seek(0.5) == ghost.frame(29)
+        assert ghost.frame(1000) == ghost.frame(89)
+        assert ghost.frame(89)[0][2] == PoseType.SLEEPING
+    finally:
+        ghost.close()
+
+
+def test_truncated_ghost_is_rejected(tmp_path):
+    level_path, recording, _ = _record(tmp_path, 10)
+    ghost_path = tmp_path / "run.ghost"
+    GhostStore.build(str(ghost_path), recording, level_path)
+    ghost_path.write_bytes(ghost_path.read_bytes()[:-1])
+    with pytest.raises(ValueError):
+        GhostStore(str(ghost_path))
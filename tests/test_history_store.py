@@ -0,0 +1,69 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from others import history_store
+from others.history_store import SqliteHistoryStore, open_history
+from others.level_history_manager import LevelHistoryManager
+
+
+def test_record_and_query(tmp_path: Path):
+    store = SqliteHistoryStore(tmp_path / "history.db")
+    assert not store.has_completed("team", "level")
+    store.record_attempt("team", "level", time = 3.0, points = 2, replay = "slow.nhir")
+    store.record_attempt("team", "level", time = 2.0, points = 1)
+    store.record_attempt("other", "level2", time = 1.0, points = 5, replay = "fast.nhir")
+    assert store.has_completed("team", "level")
+    assert store.completed_levels("team") == {"level"}
+    assert store.best_time("level") == 2.0
+    assert store.best_time("missing") is None
+    assert store.best_replay("level") == "slow.nhir"
+    assert [attempt["time"] for attempt in store.get_attempts("team", "level")] == [3.0, 2.0]
+    assert store.count() == 3
+
+
+def test_pages_match_the_json_history(tmp_path: Path):
+    json_history = LevelHistoryManager(tmp_path / "history.json")
+    store = SqliteHistoryStore(tmp_path / "history.db")
+    for index in range(10):
+        for history in (json_history, store):
+            history.record_attempt(f"team{index % 3}", f"level{index % 4}", index * 1.5, 9 - index)
+    for sort_key in ("time", "points"):
+        for ascending in (True, False):
+            expected = json_history.page(sort_key, ascending, 2, 5)
+            page = store.page(sort_key, ascending, 2, 5)
+            assert [entry[sort_key] for entry in page] == [entry[sort_key] for entry in expected]
+
+
+def test_json_history_is_migrated_once(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(history_store, "HISTORY_BACKEND", "sqlite")
+    json_path = str(tmp_path / "history.json")
+    json_history = LevelHistoryManager(json_path)
+    json_history.record_attempt("team", "level", time = 4.0, points = 3)
+    json_history.save()
+    json_history.record_attempt("team", "level2", time = 5.0, points = 1)
+
+    store = open_history(json_path)
+    assert isinstance(store, SqliteHistoryStore)
+    assert store.completed_levels("team") == {"level", "level2"}
+    store.record_attempt("team", "level3", time = 1.0, points = 0)
+    assert open_history(json_path) is store
+    store.close()
+    assert SqliteHistoryStore(tmp_path / "history.db", json_path).count() == 3
+
+
+def test_failed_migration_is_tried_again(tmp_path: Path):
+    json_path = tmp_path / "history.json"
+    json_history = LevelHistoryManager(json_path)
+    json_history.record_attempt("team", "level", time = 4.0, points = 3)
+    json_history.save()
+    text = json_path.read_text(encoding="utf-8")
+    json_path.write_text(text[:len(text) // 2], encoding="utf-8")
+
+    with pytest.raises(json.JSONDecodeError):
+        SqliteHistoryStore(tmp_path / "history.db", json_path)
+    assert not (tmp_path / "history.db").exists()
+
+    json_path.write_text(text, encoding="utf-8")
+    assert SqliteHistoryStore(tmp_path / "history.db", json_path).count() == 1
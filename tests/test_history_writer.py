@@ -0,0 +1,46 @@
+import threading
+from pathlib import Path
+
+from others.history_writer import HistoryWriter
+from others.level_history_manager import LevelHistoryManager
+
+
+class _Recording:
+    def __init__(self, release: threading.Event | None = None) -> None:
+        self.release = release
+
+    def save(self, path: str) -> None:
+        if self.release is not None:
+            self.release.wait()
+        Path(path).write_bytes(b"NHIR")
+
+
+def test_queued_attempts_are_written_as_one_group(tmp_path: Path):
+    history_path = str(tmp_path / "history.json")
+    release = threading.Event()
+    writer = HistoryWriter()
+    replay = str(tmp_path / "replays" / "run.nhir")
+    writer.record_attempt(history_path, "team", "level", 2.0, 1, replay, _Recording(release))
+    for time in (3.0, 4.0):
+        writer.record_attempt(history_path, "team", "level", time, 1)
+    release.set()
+    writer.close()
+
+    attempts = LevelHistoryManager(history_path).get_attempts("team", "level")
+    assert [attempt["time"] for attempt in attempts] == [2.0, 3.0, 4.0]
+    assert attempts[0]["replay"] == replay
+    assert Path(replay).read_bytes() == b"NHIR"
+
+
+def test_full_queue_writes_the_attempt_instead_of_dropping_it(tmp_path: Path):
+    history_path = str(tmp_path / "history.json")
+    release = threading.Event()
+    writer = HistoryWriter(max_pending = 1)
+    replay = str(tmp_path / "run.nhir")
+    writer.record_attempt(history_path, "team", "level", 1.0, 0, replay, _Recording(release))
+    # the thread is held on the first attempt, so the queue fills up
+    for _ in range(3):
+        writer.record_attempt(history_path, "team", "level", 2.0, 0)
+    release.set()
+    writer.close()
+    assert len(LevelHistoryManager(history_path).get_attempts("team", "level")) == 4
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from others import ControlsType, TileType
+from simulation import InputRecording, LevelSimulation, level_digest, replay
+
+E, F = TileType.EMPTY, TileType.FLOOR
+TICK = 1 / 60
+BOUNDS = (5 * 64, 3 * 64)
+
+
+def _write_level(tmp_path):
+    grid = [
+        [E, E, E, E, E],
+        [TileType.BLUE_PLAYER, TileType.SNACK, TileType.RED_PLAYER, TileType.BUTTON, E],
+        [F, F, F, F, F],
+    ]
+    path = tmp_path / "level.json"
+    data = {"name": "recorded", "grid": [[tile.value for tile in row] for row in grid]}
+    path.write_text(json.dumps(data))
+    return str(path)
+
+
+def test_replay_reproduces_the_recorded_run(tmp_path):
+    level_path = _write_level(tmp_path)
+    simulation = LevelSimulation.from_file(level_path, BOUNDS)
+    recording = InputRecording(level_digest(level_path), 60, BOUNDS)
+    blue, red = simulation.players
+    for tick in range(200):
+        if tick == 5:
+            blue.press(ControlsType.RIGHT)
+        if tick == 30:
+            red.press(ControlsType.JUMP)
+        if tick == 90:
+            blue.release(ControlsType.RIGHT)
+            blue.press(ControlsType.LEFT)
+        recording.capture(simulation)
+        simulation.step(TICK)
+
+    loaded = InputRecording.from_bytes(recording.to_bytes())
+    assert loaded.tick_count == 200
+    assert len(loaded.runs) < 10
+
+    replayed = replay(loaded, level_path)
+    assert [player.rect for player in replayed.players] == [
+        player.rect for player in simulation.players
+    ]
+    assert replayed.total_points() == simulation.total_points() == 1
+
+
+def test_replay_rejects_another_level(tmp_path):
+    level_path = _write_level(tmp_path)
+    recording = InputRecording(b"\0" * 32, 60, BOUNDS)
+    with pytest.raises(ValueError):
+        replay(recording, level_path)
+    with pytest.raises(ValueError):
+        InputRecording.from_bytes(recording.to_bytes()[:-1] + b"\1")
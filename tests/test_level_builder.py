@@ -0,0 +1,50 @@
+import json
+import os
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+
+pygame.display.init()
+pygame.font.init()
+
+from others import Assets
+from screens.level_builder import LevelBuilder
+
+
+def test_save_check_runs_in_a_worker_that_stops_on_exit(tmp_path: Path, monkeypatch):
+    pygame.display.set_mode((960, 960))
+    builder = LevelBuilder(pygame.font.Font(None, 48), pygame.font.Font(None, 24), Assets())
+    monkeypatch.chdir(tmp_path)
+    builder._save_level()
+    pool = builder.solver_pool
+    deadline = time.perf_counter() + 60
+    while builder.pending_check is not None and time.perf_counter() < deadline:
+        builder.update(1 / 60)
+        time.sleep(0.01)
+    # the default grid puts the beds out of jumping reach
+    assert builder.status == "Beds can't be reached"
+    assert not (tmp_path / "levels").exists()
+
+    builder.on_exit()
+    assert builder.solver_pool is None
+    with pytest.raises(RuntimeError):
+        pool.submit(int)
+
+
+def test_leaving_during_a_check_saves_the_level_unchecked(tmp_path: Path, monkeypatch):
+    pygame.display.set_mode((960, 960))
+    builder = LevelBuilder(pygame.font.Font(None, 48), pygame.font.Font(None, 24), Assets())
+    monkeypatch.chdir(tmp_path)
+    builder.pending_level = {"name": "Unchecked", "grid": [[0]]}
+    builder.pending_check = Future()
+
+    builder.on_exit()
+    assert builder.pending_check is None
+    assert builder.status == "Saved unchecked"
+    (level,) = (tmp_path / "levels").iterdir()
+    assert json.loads(level.read_text(encoding = "utf-8"))["name"] == "Unchecked"
@@ -1,6 +1,8 @@
 import json
+import threading
 from pathlib import Path
-from others.level_history_manager import LevelHistoryManager
+from others import level_history_manager
+from others.level_history_manager import LevelHistoryManager, shared_history
 
 def test_empty_file(tmp_path: Path):
     manager = LevelHistoryManager(tmp_path / "history.json")
@@ -13,8 +15,10 @@ def test_record_attempt(tmp_path: Path):
     manager.record_attempt("TeamA", "Level1", time = 12.3, points = 100)
     assert "TeamA" in manager.data["teams"]
     assert "Level1" in manager.data["teams"]["TeamA"]["completed_levels"]
-    saved = json.loads(file_path.read_text(encoding="utf-8"))
-    entry = saved["teams"]["TeamA"]["completed_levels"]["Level1"][0]
+    logged = (tmp_path / "history.json.log").read_text(encoding="utf-8").splitlines()
+    assert len(logged) == 2
+    reloaded = LevelHistoryManager(file_path)
+    entry = reloaded.data["teams"]["TeamA"]["completed_levels"]["Level1"][0]
     assert entry["time"] == 12.3
     assert entry["points"] == 100
 
@@ -24,3 +28,63 @@ def test_completed_level(tmp_path: Path):
     manager.record_attempt("team", "level", time = 1.0, points = 1)
     assert manager.has_completed("team", "level")
     assert not manager.has_completed("team", "level2")
+
+def test_log_is_compacted_into_the_snapshot(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(level_history_manager, "COMPACT_AFTER", 3)
+    file_path = tmp_path / "history.json"
+    manager = LevelHistoryManager(file_path)
+    for attempt in range(4):
+        manager.record_attempt("team", "level", time = attempt, points = 0)
+    saved = json.loads(file_path.read_text(encoding="utf-8"))
+    assert len(saved["teams"]["team"]["completed_levels"]["level"]) == 3
+    assert len(LevelHistoryManager(file_path).get_attempts("team", "level")) == 4
+
+def test_log_folded_in_before_a_crash_is_not_read_twice(tmp_path: Path):
+    file_path = tmp_path / "history.json"
+    manager = LevelHistoryManager(file_path)
+    manager.record_attempt("team", "level", time = 1.0, points = 1)
+    log = (tmp_path / "history.json.log").read_text(encoding="utf-8")
+    manager.save()
+    (tmp_path / "history.json.log").write_text(log + '{"team": "te', encoding="utf-8")
+
+    reloaded = LevelHistoryManager(file_path)
+    assert len(reloaded.get_attempts("team", "level")) == 1
+    reloaded.record_attempt("team", "level", time = 2.0, points = 1)
+    assert len(LevelHistoryManager(file_path).get_attempts("team", "level")) == 2
+
+def test_pages_follow_new_attempts(tmp_path: Path):
+    manager = LevelHistoryManager(tmp_path / "history.json")
+    for time in (3.0, 1.0, 2.0):
+        manager.record_attempt("team", "level", time = time, points = 0)
+    assert [entry["time"] for entry in manager.page("time", True, 0, 2)] == [1.0, 2.0]
+    assert [entry["time"] for entry in manager.page("time", False, 1, 5)] == [2.0, 1.0]
+    manager.record_attempt("team2", "level", time = 0.5, points = 0)
+    assert manager.page("time", True, 0, 1)[0]["team"] == "team2"
+
+def test_shared_history_is_kept_until_the_files_change(tmp_path: Path):
+    file_path = tmp_path / "history.json"
+    shared = shared_history(file_path)
+    shared.record_attempt("team", "level", time = 1.0, points = 1)
+    assert shared_history(file_path) is shared
+
+    LevelHistoryManager(file_path).record_attempt("team", "level2", time = 2.0, points = 1)
+    reloaded = shared_history(file_path)
+    assert reloaded is not shared
+    assert reloaded.completed_levels("team") == {"level", "level2"}
+
+def test_shared_history_waits_for_a_write_in_progress(tmp_path: Path):
+    file_path = tmp_path / "history.json"
+    shared = shared_history(file_path)
+    shared.record_attempt("team", "level", time = 1.0, points = 1)
+    found = []
+    with shared.write_lock:
+        # the log is appended to but the signature not updated yet
+        with open(shared.log_path, "a", encoding="utf-8") as file:
+            file.write("\n")
+        thread = threading.Thread(target = lambda: found.append(shared_history(file_path)))
+        thread.start()
+        thread.join(0.1)
+        assert not found
+        shared.signature = shared._file_signature()
+    thread.join()
+    assert found == [shared]
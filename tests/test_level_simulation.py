@@ -0,0 +1,170 @@
+from others import ControlsType, TileType
+from simulation import LevelSimulation
+
+E, F = TileType.EMPTY, TileType.FLOOR
+TICK = 1 / 60
+
+
+def _grid(*rows):
+    return [[TileType(value) for value in row] for row in rows]
+
+
+def test_level_plays_to_completion():
+    grid = _grid(
+        [E, E, E, E],
+        [TileType.BLUE_PLAYER, TileType.SNACK, TileType.BLUE_BED, TileType.BLUE_BED],
+        [F, F, F, F],
+    )
+    simulation = LevelSimulation(grid, (4 * 64, 3 * 64))
+    assert simulation.is_valid()
+
+    player = simulation.players[0]
+    player.press(ControlsType.RIGHT)
+    for _ in range(60):
+        simulation.step(TICK)
+        if simulation.complete:
+            break
+
+    assert simulation.complete
+    assert simulation.total_points() == 1
+    assert simulation.snacks == []
+    assert not player.moving_right
+
+
+def test_spray_respawns_until_a_button_is_pressed():
+    grid = _grid(
+        [E, E, E],
+        [TileType.RED_PLAYER, TileType.SPRAY, TileType.BUTTON],
+        [F, F, F],
+    )
+    simulation = LevelSimulation(grid, (3 * 64, 3 * 64))
+    player = simulation.players[0]
+    start = player.rect.topleft
+
+    player.rect.x = player.x = 64
+    simulation.step(TICK)
+    assert player.rect.topleft == start
+
+    player.rect.x = player.x = 128
+    simulation.step(TICK)
+    simulation.step(TICK)
+    assert simulation.buttons[0].pressed
+    assert not simulation.sprays[0].active
+
+
+def test_bodies_have_no_instance_dict():
+    grid = _grid(
+        [TileType.BLUE_PLAYER, TileType.SNACK, TileType.BOOKS, TileType.BUTTON, TileType.SPRAY],
+        [F, F, F, F, F],
+    )
+    simulation = LevelSimulation(grid, (5 * 64, 2 * 64))
+    bodies = [
+        simulation.players[0],
+        simulation.snacks[0],
+        simulation.books[0],
+        simulation.buttons[0],
+        simulation.sprays[0],
+    ]
+    for body in bodies:
+        assert not hasattr(body, "__dict__")
+
+
+def test_player_only_collects_the_snacks_it_touches():
+    grid = _grid(
+        [TileType.BLUE_PLAYER, TileType.SNACK, TileType.SNACK, E],
+        [F, F, F, F],
+    )
+    simulation = LevelSimulation(grid, (4 * 64, 2 * 64))
+    player = simulation.players[0]
+
+    player.rect.x = player.x = 64
+    simulation.step(TICK)
+    assert [snack.x for snack in simulation.collected_snacks] == [1]
+    assert list(simulation.snack_tiles) == [(2, 0)]
+
+    simulation.step(TICK)
+    assert simulation.collected_snacks == []
+    assert player.points == 1
+
+
+def test_linked_button_only_turns_off_its_sprays():
+    grid = _grid(
+        [E, E, E, E, E],
+        [TileType.BLUE_PLAYER, TileType.BUTTON, TileType.SPRAY, TileType.SPRAY, TileType.BUTTON],
+        [F, F, F, F, F],
+    )
+    links = [{"button": [1, 1], "sprays": [[3, 1]]}]
+    simulation = LevelSimulation(grid, (5 * 64, 3 * 64), links = links)
+    player = simulation.players[0]
+    left_spray, right_spray = simulation.sprays
+
+    player.rect.x = player.x = 64
+    simulation.step(TICK)
+    assert simulation.buttons[0].pressed
+    assert left_spray.active
+    assert not right_spray.active
+
+    player.rect.x = player.x = 0
+    simulation.step(TICK)
+    assert not simulation.buttons[0].pressed
+    assert right_spray.active
+
+
+class _Recorder:
+    def __init__(self):
+        self.events = []
+
+    def trigger_pressed(self):
+        self.events.append("pressed")
+
+    def trigger_released(self):
+        self.events.append("released")
+
+
+def test_buttons_fire_only_on_contact_changes():
+    grid = _grid(
+        [E, E, E],
+        [TileType.BLUE_PLAYER, TileType.BUTTON, TileType.RED_PLAYER],
+        [F, F, F],
+    )
+    simulation = LevelSimulation(grid, (3 * 64, 3 * 64))
+    blue, red = simulation.players
+    recorder = _Recorder()
+    simulation.buttons[0].targets.append(recorder)
+
+    blue.rect.x = blue.x = 64
+    for _ in range(3):
+        simulation.step(TICK)
+    red.rect.x = red.x = 64
+    simulation.step(TICK)
+    blue.rect.x = blue.x = 0
+    simulation.step(TICK)
+    assert recorder.events == ["pressed"]
+
+    red.rect.x = red.x = 128
+    simulation.step(TICK)
+    assert recorder.events == ["pressed", "released"]
+
+
+def test_restore_returns_to_a_snapshot():
+    grid = _grid(
+        [E, E, E, E],
+        [TileType.BLUE_PLAYER, TileType.SNACK, TileType.BOOKS, TileType.BUTTON],
+        [F, F, F, F],
+    )
+    simulation = LevelSimulation(grid, (4 * 64, 3 * 64), vectorized_books = False)
+    player = simulation.players[0]
+    snapshot = simulation.snapshot()
+
+    player.press(ControlsType.RIGHT)
+    for _ in range(30):
+        simulation.step(TICK)
+    assert simulation.snacks == []
+    assert simulation.books[0].rect.x > 128
+
+    simulation.restore(snapshot)
+    assert player.rect.topleft == (0, 64)
+    assert not player.moving_right
+    assert len(simulation.snacks) == 1
+    assert simulation.books[0].rect.x == 128
+    assert simulation.book_grid.query(simulation.books[0].rect) == [simulation.books[0].rect]
@@ -0,0 +1,47 @@
+from others import InvalidationType
+from screens.screen_pool import ScreenPool
+from screens.interface import BaseScreen
+
+
+class _CountingScreen(BaseScreen):
+    created = 0
+
+    def __init__(self) -> None:
+        _CountingScreen.created += 1
+        self.entered = 0
+        self.reasons: list[InvalidationType] = []
+
+    def on_enter(self) -> None:
+        self.entered += 1
+
+    def invalidate(self, reason: InvalidationType) -> None:
+        self.reasons.append(reason)
+
+    def handle_event(self, event):
+        return None
+
+    def update(self, dt: float) -> None:
+        pass
+
+    def draw(self, screen) -> None:
+        pass
+
+
+def test_screens_are_reused():
+    _CountingScreen.created = 0
+    pool = ScreenPool({"menu": _CountingScreen})
+    first = pool.get("menu")
+    second = pool.get("menu")
+    assert first is second
+    assert _CountingScreen.created == 1
+    assert first.entered == 2
+    assert "menu" in pool
+    assert "other" not in pool
+
+def test_invalidate_reaches_only_built_screens():
+    _CountingScreen.created = 0
+    pool = ScreenPool({"menu": _CountingScreen, "board": _CountingScreen})
+    menu = pool.get("menu")
+    pool.invalidate(InvalidationType.HISTORY)
+    assert menu.reasons == [InvalidationType.HISTORY]
+    assert _CountingScreen.created == 1
@@ -0,0 +1,49 @@
+from others import TileType
+from simulation.solver import SolveResult, solve
+
+E, F = TileType.EMPTY, TileType.FLOOR
+R, B = TileType.RED_BED, TileType.BLUE_BED
+
+
+def test_beds_on_the_floor_are_solvable():
+    grid = [
+        [E, E, E, E, E, E, E, E],
+        [TileType.BLUE_PLAYER, TileType.RED_PLAYER, E, R, R, E, B, B],
+        [F, F, F, F, F, F, F, F],
+    ]
+    assert solve(grid, time_limit = 5) == SolveResult.SOLVABLE
+
+
+def test_beds_above_the_highest_jump_are_unsolvable():
+    grid = [[E] * 6 for _ in range(8)]
+    grid[0][2:6] = [R, R, B, B]
+    grid[7][0:2] = [TileType.BLUE_PLAYER, TileType.RED_PLAYER]
+    assert solve(grid, time_limit = 5) == SolveResult.UNSOLVABLE
+
+
+def test_spray_needs_the_other_cat_on_the_button():
+    grid = [
+        [E, E, E, E, E, E, E],
+        [TileType.BLUE_PLAYER, TileType.BUTTON, TileType.RED_PLAYER, TileType.SPRAY, R, R, E],
+        [F, F, F, F, F, F, F],
+    ]
+    grid[0][0:2] = [B, B]
+    assert solve(grid, time_limit = 5) == SolveResult.SOLVABLE
+
+    grid[1][1] = E
+    assert solve(grid, time_limit = 5) == SolveResult.UNSOLVABLE
+
+
+def test_a_book_lifts_a_cat_one_tile():
+    def level(platform_row):
+        grid = [[E] * 15 for _ in range(15)]
+        grid[14] = [F] * 15
+        grid[13][0:2] = [TileType.BLUE_PLAYER, TileType.RED_PLAYER]
+        grid[13][5] = TileType.BOOKS
+        grid[platform_row][9:15] = [F] * 6
+        grid[platform_row - 1][10:14] = [B, B, R, R]
+        return grid
+
+    assert solve(level(10), time_limit = 5) == SolveResult.SOLVABLE
+    # out of reach even from the book, decided before any search
+    assert solve(level(9), time_limit = 5) == SolveResult.UNSOLVABLE
@@ -0,0 +1,28 @@
+import pygame
+from others.text_cache import render_text, clear_text_cache, TEXT_CACHE_SIZE, _render
+
+pygame.font.init()
+
+def test_same_text_is_rendered_once():
+    clear_text_cache()
+    font = pygame.font.Font(None, 24)
+    first = render_text(font, "Team", pygame.Color("white"))
+    second = render_text(font, "Team", (255, 255, 255))
+    assert first is second
+    assert _render.cache_info().misses == 1
+
+def test_key_includes_color_and_antialias():
+    clear_text_cache()
+    font = pygame.font.Font(None, 24)
+    white = render_text(font, "Team", "white")
+    gray = render_text(font, "Team", "gray")
+    aliased = render_text(font, "Team", "white", antialias = False)
+    assert white is not gray
+    assert white is not aliased
+
+def test_cache_is_bounded():
+    clear_text_cache()
+    font = pygame.font.Font(None, 24)
+    for index in range(TEXT_CACHE_SIZE + 10):
+        render_text(font, str(index), "white")
+    assert _render.cache_info().currsize == TEXT_CACHE_SIZE
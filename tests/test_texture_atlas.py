@@ -0,0 +1,49 @@
+import os
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from others.texture_atlas import TextureAtlas
+
+pygame.display.init()
+pygame.display.set_mode((64, 64))
+
+def _write_image(path: Path, color: tuple[int, int, int, int]) -> str:
+    image = pygame.Surface((8, 8), pygame.SRCALPHA)
+    image.fill(color)
+    pygame.image.save(image, str(path))
+    return str(path)
+
+def test_build_and_reuse_cache(tmp_path: Path):
+    red = _write_image(tmp_path / "red.png", (255, 0, 0, 255))
+    blue = _write_image(tmp_path / "blue.png", (0, 0, 255, 255))
+    sources = {red: (64, 64), blue: (128, 64)}
+
+    atlas = TextureAtlas(sources, str(tmp_path / "cache"))
+    assert atlas.rebuilt
+    assert atlas.get(red).get_size() == (64, 64)
+    assert atlas.get(blue).get_size() == (128, 64)
+    assert atlas.get(blue).get_at((100, 10)) == pygame.Color(0, 0, 255, 255)
+
+    cached = TextureAtlas(sources, str(tmp_path / "cache"))
+    assert not cached.rebuilt
+    assert cached.get(red).get_at((10, 10)) == pygame.Color(255, 0, 0, 255)
+
+def test_changed_source_invalidates_cache(tmp_path: Path):
+    red = _write_image(tmp_path / "red.png", (255, 0, 0, 255))
+    TextureAtlas({red: (64, 64)}, str(tmp_path / "cache"))
+
+    _write_image(tmp_path / "red.png", (0, 255, 0, 255))
+    stat = os.stat(red)
+    os.utime(red, ns = (stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    atlas = TextureAtlas({red: (64, 64)}, str(tmp_path / "cache"))
+    assert atlas.rebuilt
+    assert atlas.get(red).get_at((10, 10)) == pygame.Color(0, 255, 0, 255)
+
+def test_changed_size_invalidates_cache(tmp_path: Path):
+    red = _write_image(tmp_path / "red.png", (255, 0, 0, 255))
+    TextureAtlas({red: (64, 64)}, str(tmp_path / "cache"))
+    atlas = TextureAtlas({red: (32, 32)}, str(tmp_path / "cache"))
+    assert atlas.rebuilt
+    assert atlas.get(red).get_size() == (32, 32)